@@ -1,10 +1,13 @@
 """Provide pre-made queries on top of the recorder component."""
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Iterable
 from datetime import datetime as dt, timedelta
+from fnmatch import fnmatchcase
 from http import HTTPStatus
 import logging
+import threading
 import time
 from typing import cast
 
@@ -12,6 +15,7 @@ from aiohttp import web
 from sqlalchemy import not_, or_
 import voluptuous as vol
 
+from homeassistant.auth.permissions.const import POLICY_READ
 from homeassistant.components import frontend, websocket_api
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder import history, models as history_models
@@ -20,14 +24,22 @@ from homeassistant.components.recorder.statistics import (
     statistics_during_period,
 )
 from homeassistant.components.recorder.util import session_scope
-from homeassistant.const import CONF_DOMAINS, CONF_ENTITIES, CONF_EXCLUDE, CONF_INCLUDE
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    CONF_DOMAINS,
+    CONF_ENTITIES,
+    CONF_EXCLUDE,
+    CONF_INCLUDE,
+    CONTENT_TYPE_JSON,
+    EVENT_STATE_CHANGED,
+)
+from homeassistant.core import Event, HomeAssistant, State, callback, split_entity_id
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.deprecation import deprecated_class, deprecated_function
 from homeassistant.helpers.entityfilter import (
     CONF_ENTITY_GLOBS,
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
 )
+from homeassistant.helpers.json import json_dumps
 from homeassistant.helpers.typing import ConfigType
 import homeassistant.util.dt as dt_util
 
@@ -36,8 +48,18 @@ import homeassistant.util.dt as dt_util
 _LOGGER = logging.getLogger(__name__)
 
 DOMAIN = "history"
+HISTORY_FILTERS = "history_filters"
 CONF_ORDER = "use_include_order"
 
+# Streamed responses are written in chunks of about this many bytes
+# and at most STREAM_QUEUE_SIZE chunks are buffered between the
+# database thread and the event loop
+STREAM_CHUNK_SIZE = 65536
+STREAM_QUEUE_SIZE = 4
+
+# Number of states sent per message by the history/stream command
+STREAM_MESSAGE_STATES = 1000
+
 GLOB_TO_SQL_CHARS = {
     42: "%",  # *
     46: "_",  # .
@@ -94,6 +116,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     conf = config.get(DOMAIN, {})
 
     filters = sqlalchemy_filter_from_include_exclude_conf(conf)
+    hass.data[HISTORY_FILTERS] = filters
 
     use_include_order = conf.get(CONF_ORDER)
 
@@ -101,6 +124,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     frontend.async_register_built_in_panel(hass, "history", "history", "hass:chart-box")
     websocket_api.async_register_command(hass, ws_get_statistics_during_period)
     websocket_api.async_register_command(hass, ws_get_list_statistic_ids)
+    websocket_api.async_register_command(hass, ws_stream)
 
     return True
 
@@ -172,6 +196,209 @@ async def ws_get_list_statistic_ids(
     connection.send_result(msg["id"], statistic_ids)
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "history/stream",
+        vol.Required("start_time"): str,
+        vol.Optional("end_time"): str,
+        vol.Optional("entity_ids"): [str],
+        vol.Optional("include_start_time_state", default=True): bool,
+        vol.Optional("significant_changes_only", default=True): bool,
+        vol.Optional("minimal_response", default=False): bool,
+    }
+)
+@websocket_api.async_response
+async def ws_stream(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Handle history stream websocket command.
+
+    The recorded states are sent first, in event messages of the form
+    {"states": {entity_id: [states]}} that extend the lists of the
+    previous messages. The message that ends the backlog also has
+    "backlog_complete" set, and every later message carries the new
+    states of the subscribed entities as they change.
+    """
+    msg_id = msg["id"]
+    start_time_str = msg["start_time"]
+    end_time_str = msg.get("end_time")
+
+    if start_time := dt_util.parse_datetime(start_time_str):
+        start_time = dt_util.as_utc(start_time)
+    else:
+        connection.send_error(msg_id, "invalid_start_time", "Invalid start_time")
+        return
+
+    if end_time_str:
+        if end_time := dt_util.parse_datetime(end_time_str):
+            end_time = dt_util.as_utc(end_time)
+        else:
+            connection.send_error(msg_id, "invalid_end_time", "Invalid end_time")
+            return
+    else:
+        end_time = None
+
+    entity_ids = msg.get("entity_ids")
+    filters: Filters | None = hass.data[HISTORY_FILTERS]
+    significant_changes_only = msg["significant_changes_only"]
+    now = dt_util.utcnow()
+    cancel = threading.Event()
+    # Live states are held back until the backlog has been sent
+    pending: list[State] | None = []
+
+    @callback
+    def _async_matches(state: State) -> bool:
+        """Return if a state belongs to the subscription."""
+        entity_id = state.entity_id
+        if entity_ids is not None:
+            if entity_id not in entity_ids:
+                return False
+        elif state.domain in history.IGNORE_DOMAINS or (
+            filters and not filters.matches(entity_id)
+        ):
+            return False
+        return connection.user.permissions.check_entity(entity_id, POLICY_READ)
+
+    @callback
+    def _async_forward_state(event: Event) -> None:
+        """Forward the new state of a subscribed entity."""
+        if (new_state := event.data["new_state"]) is None:
+            return
+        if end_time is not None and new_state.last_updated >= end_time:
+            return
+        if (
+            significant_changes_only
+            and new_state.last_changed != new_state.last_updated
+            and new_state.domain not in history.SIGNIFICANT_DOMAINS
+        ):
+            return
+        if not _async_matches(new_state):
+            return
+        if pending is not None:
+            pending.append(new_state)
+            return
+        connection.send_message(
+            websocket_api.messages.event_message(
+                msg_id, {"states": {new_state.entity_id: [new_state]}}
+            )
+        )
+
+    unsub = None
+    if end_time is None or end_time > now:
+        unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, _async_forward_state)
+
+    @callback
+    def _async_unsubscribe() -> None:
+        """Stop sending the backlog and the live states."""
+        cancel.set()
+        if unsub:
+            unsub()
+
+    connection.subscriptions[msg_id] = _async_unsubscribe
+    connection.send_result(msg_id)
+
+    last_updated = await hass.async_add_executor_job(
+        _send_history_backlog,
+        hass,
+        connection,
+        msg_id,
+        cancel,
+        start_time,
+        min(end_time, now) if end_time else now,
+        entity_ids,
+        filters,
+        msg["include_start_time_state"],
+        significant_changes_only,
+        msg["minimal_response"],
+    )
+    if cancel.is_set():
+        return
+
+    states: dict[str, list[State]] = {}
+    # The recorder commits in batches, so the current state of an
+    # entity may not have made it to the database yet
+    if end_time is None or end_time > now:
+        for state in hass.states.async_all():
+            if (
+                start_time <= state.last_updated < now
+                and state.last_updated > last_updated.get(state.entity_id, start_time)
+                and _async_matches(state)
+            ):
+                states[state.entity_id] = [state]
+    for state in pending:
+        states.setdefault(state.entity_id, []).append(state)
+    pending = None
+
+    connection.send_message(
+        websocket_api.messages.event_message(
+            msg_id, {"states": states, "backlog_complete": True}
+        )
+    )
+
+
+def _send_history_backlog(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg_id: int,
+    cancel: threading.Event,
+    start_time: dt,
+    end_time: dt,
+    entity_ids: list[str] | None,
+    filters: Filters | None,
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+) -> dict[str, dt]:
+    """Send the recorded states in chunks and return the last update of each entity."""
+    permissions = connection.user.permissions
+    last_updated: dict[str, dt] = {}
+    chunk: dict[str, list] = {}
+    count = 0
+
+    def _send_chunk() -> None:
+        """Send the collected states from the event loop."""
+        message = websocket_api.messages.message_to_json(
+            websocket_api.messages.event_message(msg_id, {"states": chunk})
+        )
+        hass.loop.call_soon_threadsafe(connection.send_message, message)
+
+    with session_scope(hass=hass) as session:
+        for entity_id, states in history.iter_significant_states_with_session(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+        ):
+            if not permissions.check_entity(entity_id, POLICY_READ):
+                continue
+            ent_states = chunk[entity_id] = []
+            state = None
+            for state in states:
+                ent_states.append(state)
+                count += 1
+                if count >= STREAM_MESSAGE_STATES:
+                    if cancel.is_set():
+                        return last_updated
+                    _send_chunk()
+                    chunk = {}
+                    ent_states = chunk[entity_id] = []
+                    count = 0
+            # The last state of an entity is never a minimal one
+            if state is not None:
+                last_updated[entity_id] = state.last_updated
+            if not ent_states:
+                del chunk[entity_id]
+        if chunk and not cancel.is_set():
+            _send_chunk()
+
+    return last_updated
+
+
 class HistoryPeriodView(HomeAssistantView):
     """Handle history period requests."""
 
@@ -186,7 +413,7 @@ class HistoryPeriodView(HomeAssistantView):
 
     async def get(
         self, request: web.Request, datetime: str | None = None
-    ) -> web.Response:
+    ) -> web.StreamResponse:
         """Return history over a period of time."""
         datetime_ = None
         if datetime and (datetime_ := dt_util.parse_datetime(datetime)) is None:
@@ -220,6 +447,7 @@ class HistoryPeriodView(HomeAssistantView):
         )
 
         minimal_response = "minimal_response" in request.query
+        stream = "stream" in request.query
 
         hass = request.app["hass"]
 
@@ -230,6 +458,18 @@ class HistoryPeriodView(HomeAssistantView):
         ):
             return self.json([])
 
+        if stream:
+            return await self._stream_significant_states_json(
+                request,
+                hass,
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+            )
+
         return cast(
             web.Response,
             await hass.async_add_executor_job(
@@ -290,6 +530,120 @@ class HistoryPeriodView(HomeAssistantView):
 
         return self.json(result)
 
+    async def _stream_significant_states_json(
+        self,
+        request,
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+    ):
+        """Stream significant stats from the database as chunked json.
+
+        The states are encoded in the executor and handed over to the
+        event loop through a bounded queue, so the database thread is
+        paced by the client and memory use does not grow with the period.
+        The entities are not reordered by use_include_order.
+        """
+        queue: asyncio.Queue[bytes | None] = asyncio.Queue(STREAM_QUEUE_SIZE)
+        cancel = threading.Event()
+
+        def put(chunk: bytes | None) -> None:
+            """Hand a chunk to the event loop, waiting while the queue is full."""
+            if not cancel.is_set():
+                asyncio.run_coroutine_threadsafe(queue.put(chunk), hass.loop).result()
+
+        response = web.StreamResponse(headers={"Content-Type": CONTENT_TYPE_JSON})
+        response.enable_compression()
+        await response.prepare(request)
+
+        producer = hass.async_add_executor_job(
+            self._encode_significant_states_json,
+            put,
+            cancel,
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+        )
+        try:
+            while (chunk := await queue.get()) is not None:
+                await response.write(chunk)
+        finally:
+            cancel.set()
+            # Unblock a producer that is waiting for room in the queue
+            while not queue.empty():
+                queue.get_nowait()
+            await producer
+
+        await response.write_eof()
+        return response
+
+    def _encode_significant_states_json(
+        self,
+        put,
+        cancel,
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+    ):
+        """Encode significant stats from the database into json chunks."""
+        timer_start = time.perf_counter()
+        buffer: list[str] = ["["]
+        size = 0
+        count = 0
+
+        try:
+            with session_scope(hass=hass) as session:
+                for idx, (_, states) in enumerate(
+                    history.iter_significant_states_with_session(
+                        hass,
+                        session,
+                        start_time,
+                        end_time,
+                        entity_ids,
+                        self.filters,
+                        include_start_time_state,
+                        significant_changes_only,
+                        minimal_response,
+                    )
+                ):
+                    buffer.append(",[" if idx else "[")
+                    for state_idx, state in enumerate(states):
+                        encoded = json_dumps(state)
+                        buffer.append(f",{encoded}" if state_idx else encoded)
+                        size += len(encoded)
+                        count += 1
+                        if size >= STREAM_CHUNK_SIZE:
+                            if cancel.is_set():
+                                return
+                            put("".join(buffer).encode("UTF-8"))
+                            buffer = []
+                            size = 0
+                    buffer.append("]")
+            buffer.append("]")
+            put("".join(buffer).encode("UTF-8"))
+        except (ValueError, TypeError) as err:
+            _LOGGER.error("Unable to serialize to JSON: %s", err)
+            raise
+        finally:
+            # Always end the stream so the event loop stops waiting
+            put(None)
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - timer_start
+            _LOGGER.debug("Streamed %d states in %fs", count, elapsed)
+
 
 def sqlalchemy_filter_from_include_exclude_conf(conf: ConfigType) -> Filters | None:
     """Build a sql filter from config."""
@@ -319,6 +673,29 @@ class Filters:
         self.included_domains: list[str] = []
         self.included_entity_globs: list[str] = []
 
+    def matches(self, entity_id: str) -> bool:
+        """Return if an entity id passes the filter the same way entity_filter does."""
+        domain = split_entity_id(entity_id)[0]
+        if (
+            self.included_domains
+            or self.included_entities
+            or self.included_entity_globs
+        ) and not _matches_any(
+            entity_id,
+            domain,
+            self.included_domains,
+            self.included_entities,
+            self.included_entity_globs,
+        ):
+            return False
+        return not _matches_any(
+            entity_id,
+            domain,
+            self.excluded_domains,
+            self.excluded_entities,
+            self.excluded_entity_globs,
+        )
+
     def apply(self, query):
         """Apply the entity filter."""
         if not self.has_config:
@@ -381,6 +758,21 @@ class Filters:
         return or_(*includes) & not_(or_(*excludes))
 
 
+def _matches_any(
+    entity_id: str,
+    domain: str,
+    domains: list[str],
+    entities: list[str],
+    globs: list[str],
+) -> bool:
+    """Return if an entity id matches any of the domains, entities or globs."""
+    return (
+        domain in domains
+        or entity_id in entities
+        or any(fnmatchcase(entity_id, glob) for glob in globs)
+    )
+
+
 def _glob_to_like(glob_str):
     """Translate glob to sql."""
     return history_models.States.entity_id.like(glob_str.translate(GLOB_TO_SQL_CHARS))
@@ -1,22 +1,28 @@
 """Event parser and human readable log generator."""
+from __future__ import annotations
+
+import asyncio
 from contextlib import suppress
-from datetime import timedelta
+from datetime import datetime as dt, timedelta
 from http import HTTPStatus
 from itertools import groupby
 import json
 import re
+from typing import NamedTuple
 
 import sqlalchemy
 from sqlalchemy.orm import aliased
 from sqlalchemy.sql.expression import literal
 import voluptuous as vol
 
-from homeassistant.components import frontend
+from homeassistant.components import frontend, websocket_api
 from homeassistant.components.automation import EVENT_AUTOMATION_TRIGGERED
 from homeassistant.components.history import sqlalchemy_filter_from_include_exclude_conf
 from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.models import (
     Events,
+    StateAttributes,
     States,
     process_timestamp_to_utc_isoformat,
 )
@@ -29,6 +35,7 @@ from homeassistant.const import (
     ATTR_ICON,
     ATTR_NAME,
     ATTR_SERVICE,
+    ATTR_UNIT_OF_MEASUREMENT,
     EVENT_CALL_SERVICE,
     EVENT_HOMEASSISTANT_START,
     EVENT_HOMEASSISTANT_STOP,
@@ -37,6 +44,7 @@ from homeassistant.const import (
 )
 from homeassistant.core import (
     DOMAIN as HA_DOMAIN,
+    Event,
     HomeAssistant,
     ServiceCall,
     callback,
@@ -65,6 +73,7 @@ ATTR_MESSAGE = "message"
 CONTINUOUS_DOMAINS = ["proximity", "sensor"]
 
 DOMAIN = "logbook"
+LOGBOOK_FILTERS = "logbook_filters"
 
 GROUP_BY_MINUTES = 15
 
@@ -73,6 +82,13 @@ UNIT_OF_MEASUREMENT_JSON = '"unit_of_measurement":'
 
 HA_DOMAIN_ENTITY_ID = f"{HA_DOMAIN}."
 
+# Bounds of the caches kept for the lifetime of an event stream
+MAX_CONTEXT_LOOKUP = 16384
+MAX_ENTITY_ATTR_CACHE = 4096
+
+# Seconds to wait for the recorder to commit before sending the backlog
+MAX_RECORDER_WAIT = 10
+
 CONFIG_SCHEMA = vol.Schema(
     {DOMAIN: INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA}, extra=vol.ALLOW_EXTRA
 )
@@ -166,7 +182,9 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         filters = None
         entities_filter = None
 
+    hass.data[LOGBOOK_FILTERS] = (filters, entities_filter)
     hass.http.register_view(LogbookView(conf, filters, entities_filter))
+    websocket_api.async_register_command(hass, ws_event_stream)
 
     hass.services.async_register(DOMAIN, "log", log_message, schema=LOG_MESSAGE_SCHEMA)
 
@@ -257,6 +275,178 @@ class LogbookView(HomeAssistantView):
         return await hass.async_add_executor_job(json_events)
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "logbook/event_stream",
+        vol.Required("start_time"): str,
+        vol.Optional("end_time"): str,
+        vol.Optional("entity_ids"): [str],
+    }
+)
+@websocket_api.async_response
+async def ws_event_stream(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Handle logbook event stream websocket command.
+
+    The logbook entries of the period are sent once, in an event message
+    of the form {"events": [entries]} that also has "backlog_complete"
+    set. Every later message carries the entries of new events as they
+    are fired, humanified with the context and attribute caches of the
+    stream so the database is not queried again.
+    """
+    msg_id = msg["id"]
+    start_time_str = msg["start_time"]
+    end_time_str = msg.get("end_time")
+
+    if start_time := dt_util.parse_datetime(start_time_str):
+        start_time = dt_util.as_utc(start_time)
+    else:
+        connection.send_error(msg_id, "invalid_start_time", "Invalid start_time")
+        return
+
+    if end_time_str:
+        if end_time := dt_util.parse_datetime(end_time_str):
+            end_time = dt_util.as_utc(end_time)
+        else:
+            connection.send_error(msg_id, "invalid_end_time", "Invalid end_time")
+            return
+    else:
+        end_time = None
+
+    if entity_ids := msg.get("entity_ids"):
+        try:
+            entity_ids = cv.entity_ids(entity_ids)
+        except vol.Invalid:
+            connection.send_error(
+                msg_id, "invalid_entity_ids", f"Invalid entity id(s): {entity_ids}"
+            )
+            return
+
+    filters, entities_filter = hass.data[LOGBOOK_FILTERS]
+    if entity_ids:
+        entities_filter = generate_filter([], entity_ids, [], [])
+    else:
+        entity_ids = None
+    entity_attr_cache = EntityAttributeCache(hass, MAX_ENTITY_ATTR_CACHE)
+    context_lookup = ContextLookup(MAX_CONTEXT_LOOKUP)
+    now = dt_util.utcnow()
+    # Live events are held back until the backlog has been sent
+    pending: list[LazyEventPartialState] | None = []
+
+    @callback
+    def _async_send_events(events: list[LazyEventPartialState]) -> None:
+        """Humanify the events and send them."""
+        connection.send_message(
+            websocket_api.messages.event_message(
+                msg_id,
+                {
+                    "events": list(
+                        humanify(hass, events, entity_attr_cache, context_lookup)
+                    )
+                },
+            )
+        )
+
+    @callback
+    def _async_forward_event(event: Event) -> None:
+        """Forward an event if it has a logbook entry."""
+        if end_time is not None and event.time_fired >= end_time:
+            return
+        if event.event_type == EVENT_STATE_CHANGED and not _keep_state_change(
+            event, entities_filter
+        ):
+            return
+        lazy_event = LazyEventPartialState.from_event(event)
+        if pending is not None:
+            pending.append(lazy_event)
+            return
+        context_lookup.setdefault(lazy_event.context_id, lazy_event)
+        if event.event_type == EVENT_CALL_SERVICE or (
+            event.event_type != EVENT_STATE_CHANGED
+            and not _keep_event(hass, lazy_event, entities_filter)
+        ):
+            return
+        _async_send_events([lazy_event])
+
+    unsubs = []
+    if end_time is None or end_time > now:
+        unsubs = [
+            hass.bus.async_listen(event_type, _async_forward_event)
+            for event_type in {*ALL_EVENT_TYPES, *hass.data[DOMAIN]}
+        ]
+
+    @callback
+    def _async_unsubscribe() -> None:
+        """Stop sending new events."""
+        for unsub in unsubs:
+            unsub()
+
+    connection.subscriptions[msg_id] = _async_unsubscribe
+    connection.send_result(msg_id)
+
+    # Make sure the recent events are in the database
+    # as the live events only start now
+    with suppress(asyncio.TimeoutError):
+        await asyncio.wait_for(
+            hass.data[DATA_INSTANCE].async_block_till_done(), MAX_RECORDER_WAIT
+        )
+
+    backlog = await hass.async_add_executor_job(
+        _get_events,
+        hass,
+        start_time,
+        min(end_time, now) if end_time else now,
+        entity_ids,
+        filters,
+        entities_filter,
+        False,
+        None,
+        entity_attr_cache,
+        context_lookup,
+    )
+    if msg_id not in connection.subscriptions:
+        return
+
+    events = []
+    for lazy_event in pending:
+        context_lookup.setdefault(lazy_event.context_id, lazy_event)
+        if lazy_event.event_type == EVENT_STATE_CHANGED or (
+            lazy_event.event_type != EVENT_CALL_SERVICE
+            and _keep_event(hass, lazy_event, entities_filter)
+        ):
+            events.append(lazy_event)
+    pending = None
+
+    connection.send_message(
+        websocket_api.messages.event_message(
+            msg_id,
+            {
+                "events": backlog
+                + list(humanify(hass, events, entity_attr_cache, context_lookup)),
+                "backlog_complete": True,
+            },
+        )
+    )
+
+
+def _keep_state_change(event: Event, entities_filter) -> bool:
+    """Return if a live state change has a logbook entry.
+
+    This matches the filters applied to the states in the database queries.
+    """
+    old_state = event.data.get("old_state")
+    new_state = event.data.get("new_state")
+    if old_state is None or new_state is None or old_state.state == new_state.state:
+        return False
+    if (
+        new_state.domain in CONTINUOUS_DOMAINS
+        and ATTR_UNIT_OF_MEASUREMENT in new_state.attributes
+    ):
+        return False
+    return entities_filter is None or entities_filter(new_state.entity_id)
+
+
 def humanify(hass, events, entity_attr_cache, context_lookup):
     """Generate a converted list of events into Entry objects.
 
@@ -419,14 +609,22 @@ def _get_events(
     entities_filter=None,
     entity_matches_only=False,
     context_id=None,
+    entity_attr_cache=None,
+    context_lookup=None,
 ):
-    """Get events for a period of time."""
+    """Get events for a period of time.
+
+    The event stream passes in its own caches so they
+    can be reused for the events fired afterwards.
+    """
     assert not (
         entity_ids and context_id
     ), "can't pass in both entity_ids and context_id"
 
-    entity_attr_cache = EntityAttributeCache(hass)
-    context_lookup = {None: None}
+    if entity_attr_cache is None:
+        entity_attr_cache = EntityAttributeCache(hass)
+    if context_lookup is None:
+        context_lookup = ContextLookup()
 
     def yield_events(query):
         """Yield Events that are not filtered away."""
@@ -450,7 +648,7 @@ def _get_events(
             query = _generate_events_query_without_states(session)
             query = _apply_event_time_filter(query, start_day, end_day)
             query = _apply_event_types_filter(
-                hass, query, ALL_EVENT_TYPES_EXCEPT_STATE_CHANGED
+                hass, session, query, ALL_EVENT_TYPES_EXCEPT_STATE_CHANGED
             )
             if entity_matches_only:
                 # When entity_matches_only is provided, contexts and events that do not
@@ -459,14 +657,14 @@ def _get_events(
 
             query = query.union_all(
                 _generate_states_query(
-                    session, start_day, end_day, old_state, entity_ids
+                    hass, session, start_day, end_day, old_state, entity_ids
                 )
             )
         else:
             query = _generate_events_query(session)
             query = _apply_event_time_filter(query, start_day, end_day)
             query = _apply_events_types_and_states_filter(
-                hass, query, old_state
+                hass, session, query, old_state
             ).filter(
                 (States.last_updated == States.last_changed)
                 | (Events.event_type != EVENT_STATE_CHANGED)
@@ -493,6 +691,7 @@ def _generate_events_query(session):
         States.entity_id,
         States.domain,
         States.attributes,
+        StateAttributes.shared_attrs,
     )
 
 
@@ -503,28 +702,36 @@ def _generate_events_query_without_states(session):
         literal(value=None, type_=sqlalchemy.String).label("entity_id"),
         literal(value=None, type_=sqlalchemy.String).label("domain"),
         literal(value=None, type_=sqlalchemy.Text).label("attributes"),
+        literal(value=None, type_=sqlalchemy.Text).label("shared_attrs"),
     )
 
 
-def _generate_states_query(session, start_day, end_day, old_state, entity_ids):
+def _generate_states_query(hass, session, start_day, end_day, old_state, entity_ids):
+    metadata_ids = hass.data[DATA_INSTANCE].states_meta_ids.get_ids(session, entity_ids)
     return (
         _generate_events_query(session)
         .outerjoin(Events, (States.event_id == Events.event_id))
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+        )
         .filter(_missing_state_matcher(old_state))
         .filter(_continuous_entity_matcher())
         .filter((States.last_updated > start_day) & (States.last_updated < end_day))
         .filter(
             (States.last_updated == States.last_changed)
-            & States.entity_id.in_(entity_ids)
+            & States.metadata_id.in_(metadata_ids)
         )
     )
 
 
-def _apply_events_types_and_states_filter(hass, query, old_state):
+def _apply_events_types_and_states_filter(hass, session, query, old_state):
     events_query = (
         query.outerjoin(States, (Events.event_id == States.event_id))
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+        )
         .filter(
             (Events.event_type != EVENT_STATE_CHANGED)
             | _missing_state_matcher(old_state)
@@ -533,7 +740,7 @@ def _apply_events_types_and_states_filter(hass, query, old_state):
             (Events.event_type != EVENT_STATE_CHANGED) | _continuous_entity_matcher()
         )
     )
-    return _apply_event_types_filter(hass, events_query, ALL_EVENT_TYPES)
+    return _apply_event_types_filter(hass, session, events_query, ALL_EVENT_TYPES)
 
 
 def _missing_state_matcher(old_state):
@@ -555,6 +762,9 @@ def _continuous_entity_matcher():
     return sqlalchemy.or_(
         sqlalchemy.not_(States.domain.in_(CONTINUOUS_DOMAINS)),
         sqlalchemy.not_(States.attributes.contains(UNIT_OF_MEASUREMENT_JSON)),
+        sqlalchemy.not_(
+            StateAttributes.shared_attrs.contains(UNIT_OF_MEASUREMENT_JSON)
+        ),
     )
 
 
@@ -564,10 +774,11 @@ def _apply_event_time_filter(events_query, start_day, end_day):
     )
 
 
-def _apply_event_types_filter(hass, query, event_types):
-    return query.filter(
-        Events.event_type.in_(event_types + list(hass.data.get(DOMAIN, {})))
+def _apply_event_types_filter(hass, session, query, event_types):
+    event_type_ids = hass.data[DATA_INSTANCE].event_type_ids.get_ids(
+        session, event_types + list(hass.data.get(DOMAIN, {}))
     )
+    return query.filter(Events.event_type_id.in_(event_type_ids))
 
 
 def _apply_event_entity_id_matchers(events_query, entity_ids):
@@ -670,6 +881,50 @@ def _entity_name_from_event(entity_id, event, entity_attr_cache):
     ) or split_entity_id(entity_id)[1].replace("_", " ")
 
 
+class EventAsRow(NamedTuple):
+    """An event fired on the bus in the shape of a logbook query row."""
+
+    event_type: str
+    event_data: str
+    time_fired: dt
+    context_id: str
+    context_user_id: str | None
+    context_parent_id: str | None
+    state: str | None = None
+    entity_id: str | None = None
+    domain: str | None = None
+    attributes: str | None = None
+    shared_attrs: str | None = None
+
+
+class ContextLookup:
+    """A lookup of the first event seen for each context id.
+
+    With max_size the oldest contexts are evicted once it is full,
+    which bounds the memory used by a long running event stream.
+    """
+
+    def __init__(self, max_size=None):
+        """Init the lookup."""
+        self._max_size = max_size
+        self._lookup = {}
+
+    def setdefault(self, context_id, event):
+        """Add the event of a context unless the context is already known."""
+        if context_id is None:
+            return None
+        if (context_event := self._lookup.get(context_id)) is not None:
+            return context_event
+        if self._max_size and len(self._lookup) >= self._max_size:
+            del self._lookup[next(iter(self._lookup))]
+        self._lookup[context_id] = event
+        return event
+
+    def get(self, context_id):
+        """Return the first event of a context."""
+        return self._lookup.get(context_id)
+
+
 class LazyEventPartialState:
     """A lazy version of core Event with limited State joined in."""
 
@@ -678,6 +933,7 @@ class LazyEventPartialState:
         "_event_data",
         "_time_fired_isoformat",
         "_attributes",
+        "_shared_attrs",
         "event_type",
         "entity_id",
         "state",
@@ -694,6 +950,9 @@ class LazyEventPartialState:
         self._event_data = None
         self._time_fired_isoformat = None
         self._attributes = None
+        # Newer states have their attributes in the state_attributes
+        # table, older states still have them in the states table
+        self._shared_attrs = self._row.shared_attrs or self._row.attributes
         self.event_type = self._row.event_type
         self.entity_id = self._row.entity_id
         self.state = self._row.state
@@ -703,13 +962,47 @@ class LazyEventPartialState:
         self.context_parent_id = self._row.context_parent_id
         self.time_fired_minute = self._row.time_fired.minute
 
+    @classmethod
+    def from_event(cls, event):
+        """Create a lazy event from an event fired on the bus."""
+        context = event.context
+        if event.event_type == EVENT_STATE_CHANGED:
+            new_state = event.data["new_state"]
+            lazy_event = cls(
+                EventAsRow(
+                    event.event_type,
+                    EMPTY_JSON_OBJECT,
+                    event.time_fired,
+                    context.id,
+                    context.user_id,
+                    context.parent_id,
+                    new_state.state,
+                    new_state.entity_id,
+                    new_state.domain,
+                )
+            )
+            lazy_event._attributes = new_state.attributes
+        else:
+            lazy_event = cls(
+                EventAsRow(
+                    event.event_type,
+                    EMPTY_JSON_OBJECT,
+                    event.time_fired,
+                    context.id,
+                    context.user_id,
+                    context.parent_id,
+                )
+            )
+            lazy_event._event_data = event.data
+        return lazy_event
+
     @property
     def attributes_icon(self):
         """Extract the icon from the decoded attributes or json."""
         if self._attributes:
             return self._attributes.get(ATTR_ICON)
 
-        result = ICON_JSON_EXTRACT.search(self._row.attributes)
+        result = ICON_JSON_EXTRACT.search(self._shared_attrs or EMPTY_JSON_OBJECT)
         return result and result.group(1)
 
     @property
@@ -734,13 +1027,10 @@ class LazyEventPartialState:
     def attributes(self):
         """State attributes."""
         if not self._attributes:
-            if (
-                self._row.attributes is None
-                or self._row.attributes == EMPTY_JSON_OBJECT
-            ):
+            if self._shared_attrs is None or self._shared_attrs == EMPTY_JSON_OBJECT:
                 self._attributes = {}
             else:
-                self._attributes = json.loads(self._row.attributes)
+                self._attributes = json.loads(self._shared_attrs)
         return self._attributes
 
     @property
@@ -771,9 +1061,10 @@ class EntityAttributeCache:
     that are expected to change state.
     """
 
-    def __init__(self, hass):
+    def __init__(self, hass, max_size=None):
         """Init the cache."""
         self._hass = hass
+        self._max_size = max_size
         self._cache = {}
 
     def get(self, entity_id, attribute, event):
@@ -782,6 +1073,8 @@ class EntityAttributeCache:
             if attribute in self._cache[entity_id]:
                 return self._cache[entity_id][attribute]
         else:
+            if self._max_size and len(self._cache) >= self._max_size:
+                del self._cache[next(iter(self._cache))]
             self._cache[entity_id] = {}
 
         if current_state := self._hass.states.get(entity_id):
@@ -6,7 +6,7 @@ import logging
 
 import voluptuous as vol
 
-from homeassistant.components.recorder.models import States
+from homeassistant.components.recorder.models import States, StatesMeta
 from homeassistant.components.recorder.util import execute, session_scope
 from homeassistant.const import (
     ATTR_TEMPERATURE,
@@ -313,8 +313,9 @@ class Plant(Entity):
         with session_scope(hass=self.hass) as session:
             query = (
                 session.query(States)
+                .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
                 .filter(
-                    (States.entity_id == entity_id.lower())
+                    (StatesMeta.entity_id == entity_id.lower())
                     and (States.last_updated > start_date)
                 )
                 .order_by(States.last_updated.asc())
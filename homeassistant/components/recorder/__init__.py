@@ -14,6 +14,7 @@ import threading
 import time
 from typing import Any
 
+from lru import LRU  # pylint: disable=no-name-in-module
 from sqlalchemy import create_engine, event as sqlalchemy_event, exc, func, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import scoped_session, sessionmaker
@@ -54,6 +55,7 @@ from homeassistant.loader import bind_hass
 import homeassistant.util.dt as dt_util
 
 from . import history, migration, purge, statistics, websocket_api
+from .bulk import BULK_INSERT_DIALECTS, BulkWriter
 from .const import (
     CONF_DB_INTEGRITY_CHECK,
     DATA_INSTANCE,
@@ -61,11 +63,15 @@ from .const import (
     MAX_QUEUE_BACKLOG,
     SQLITE_URL_PREFIX,
 )
+from .dimensions import DimensionIdMap
 from .models import (
     Base,
     Events,
+    EventTypes,
     RecorderRuns,
+    StateAttributes,
     States,
+    StatesMeta,
     StatisticsRuns,
     process_timestamp,
 )
@@ -126,6 +132,14 @@ KEEPALIVE_TIME = 30
 # States and Events objects
 EXPIRE_AFTER_COMMITS = 120
 
+# The number of attribute ids to cache in memory
+#
+# Based on:
+# - The number of overlapping attributes
+# - How frequently states with overlapping attributes will change
+# - How much memory our low end hardware has
+STATE_ATTRIBUTES_ID_CACHE_SIZE = 2048
+
 DB_LOCK_TIMEOUT = 30
 DB_LOCK_QUEUE_CHECK_TIMEOUT = 1
 
@@ -137,6 +151,7 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_BULK_INSERT = "bulk_insert"
 
 INVALIDATED_ERR = "Database connection invalidated"
 CONNECTIVITY_ERR = "Error in database connectivity during commit"
@@ -165,6 +180,7 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_COMMIT_INTERVAL, default=DEFAULT_COMMIT_INTERVAL
                     ): cv.positive_int,
+                    vol.Optional(CONF_BULK_INSERT, default=False): cv.boolean,
                     vol.Optional(
                         CONF_DB_MAX_RETRIES, default=DEFAULT_DB_MAX_RETRIES
                     ): cv.positive_int,
@@ -241,6 +257,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     auto_purge = conf[CONF_AUTO_PURGE]
     keep_days = conf[CONF_PURGE_KEEP_DAYS]
     commit_interval = conf[CONF_COMMIT_INTERVAL]
+    bulk_insert = conf[CONF_BULK_INSERT]
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
     db_url = conf.get(CONF_DB_URL) or DEFAULT_URL.format(
@@ -263,6 +280,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         db_retry_wait=db_retry_wait,
         entity_filter=entity_filter,
         exclude_t=exclude_t,
+        bulk_insert=bulk_insert,
     )
     instance.async_initialize()
     instance.start()
@@ -371,6 +389,7 @@ class PurgeTask(RecorderTask):
 
     def run(self, instance: Recorder) -> None:
         """Purge the database."""
+        instance.commit_pending_bulk_rows()
         if purge.purge_old_data(
             instance, self.purge_before, self.repack, self.apply_filter
         ):
@@ -391,6 +410,7 @@ class PurgeEntitiesTask(RecorderTask):
 
     def run(self, instance: Recorder) -> None:
         """Purge entities from the database."""
+        instance.commit_pending_bulk_rows()
         if purge.purge_entity_data(instance, self.entity_filter):
             return
         # Schedule a new purge task if this one didn't finish
@@ -444,6 +464,20 @@ class WaitTask(RecorderTask):
         instance._queue_watch.set()  # pylint: disable=[protected-access]
 
 
+@dataclass
+class SynchronizeTask(RecorderTask):
+    """An object to insert into the recorder queue to commit the pending events."""
+
+    event: asyncio.Event
+
+    def run(self, instance: Recorder) -> None:
+        """Handle the task."""
+        try:
+            instance._commit_event_session_or_retry()  # pylint: disable=[protected-access]
+        finally:
+            instance.hass.loop.call_soon_threadsafe(self.event.set)
+
+
 @dataclass
 class DatabaseLockTask(RecorderTask):
     """An object to insert into the recorder queue to prevent writes to the database."""
@@ -466,6 +500,15 @@ class StopTask(RecorderTask):
         instance.stop_requested = True
 
 
+@dataclass
+class TickTask(RecorderTask):
+    """An object to insert into the recorder queue on each timer tick."""
+
+    def run(self, instance: Recorder) -> None:
+        """Handle the task."""
+        instance._process_tick()  # pylint: disable=[protected-access]
+
+
 @dataclass
 class EventTask(RecorderTask):
     """An object to insert into the recorder queue to stop the event handler."""
@@ -494,6 +537,7 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         entity_filter: Callable[[str], bool],
         exclude_t: list[str],
+        bulk_insert: bool = False,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -520,11 +564,18 @@ class Recorder(threading.Thread):
         self._commits_without_expire = 0
         self._keepalive_count = 0
         self._old_states: dict[str, States] = {}
+        self._state_attributes_ids: LRU = LRU(STATE_ATTRIBUTES_ID_CACHE_SIZE)
+        self._pending_state_attributes: dict[str, StateAttributes] = {}
+        self.states_meta_ids = DimensionIdMap(StatesMeta, "entity_id", "metadata_id")
+        self.event_type_ids = DimensionIdMap(EventTypes, "event_type", "event_type_id")
         self._pending_expunge: list[States] = []
+        self._bulk_insert = bulk_insert
+        self._bulk_writer: BulkWriter | None = None
         self.event_session = None
         self.get_session = None
         self._completed_first_database_setup = None
         self._event_listener = None
+        self._tick_listener = None
         self.async_migration_event = asyncio.Event()
         self.migration_in_progress = False
         self._queue_watcher = None
@@ -540,9 +591,14 @@ class Recorder(threading.Thread):
     @callback
     def async_initialize(self):
         """Initialize the recorder."""
+        # Events are queued right away so they stay in order with the ticks
         self._event_listener = self.hass.bus.async_listen(
-            MATCH_ALL, self.event_listener, event_filter=self._async_event_filter
+            MATCH_ALL,
+            self.event_listener,
+            event_filter=self._async_event_filter,
+            run_immediately=True,
         )
+        self._tick_listener = self.hass.async_listen_tick(self._async_tick_listener)
         self._queue_watcher = async_track_time_interval(
             self.hass, self._async_check_queue, timedelta(minutes=10)
         )
@@ -572,11 +628,15 @@ class Recorder(threading.Thread):
         if self._event_listener:
             self._event_listener()
             self._event_listener = None
+        if self._tick_listener:
+            self._tick_listener()
+            self._tick_listener = None
 
     @callback
     def _async_event_filter(self, event) -> bool:
         """Filter events."""
-        if event.event_type in self.exclude_t:
+        # The recorder counts the timer ticks from async_listen_tick
+        if event.event_type == EVENT_TIME_CHANGED or event.event_type in self.exclude_t:
             return False
 
         if (entity_id := event.data.get(ATTR_ENTITY_ID)) is None:
@@ -888,36 +948,58 @@ class Recorder(threading.Thread):
             self.queue.qsize(),
         )
 
-    def _process_one_event(self, event):
-        if event.event_type == EVENT_TIME_CHANGED:
-            self._keepalive_count += 1
-            if self._keepalive_count >= KEEPALIVE_TIME:
-                self._keepalive_count = 0
-                self._send_keep_alive()
-            if self.commit_interval:
-                self._timechanges_seen += 1
-                if self._timechanges_seen >= self.commit_interval:
-                    self._timechanges_seen = 0
-                    self._commit_event_session_or_retry()
-            return
+    def _process_tick(self):
+        """Send the keepalive and commit on the timer ticks."""
+        self._keepalive_count += 1
+        if self._keepalive_count >= KEEPALIVE_TIME:
+            self._keepalive_count = 0
+            self._send_keep_alive()
+        if self.commit_interval:
+            self._timechanges_seen += 1
+            if self._timechanges_seen >= self.commit_interval:
+                self._timechanges_seen = 0
+                self._commit_event_session_or_retry()
 
+    def _process_one_event(self, event):
         if not self.enabled:
             return
 
+        if self._bulk_writer is not None:
+            self._add_event_to_bulk_writer(event)
+        else:
+            self._add_event_to_session(event)
+
+        # If they do not have a commit interval
+        # than we commit right away
+        if not self.commit_interval:
+            self._commit_event_session_or_retry()
+
+    def _add_event_to_session(self, event):
+        """Add the event and its state as ORM objects to the event session."""
         try:
             if event.event_type == EVENT_STATE_CHANGED:
                 dbevent = Events.from_event(event, event_data="{}")
             else:
                 dbevent = Events.from_event(event)
             dbevent.created = event.time_fired
-            self.event_session.add(dbevent)
         except (TypeError, ValueError):
             _LOGGER.warning("Event is not JSON serializable: %s", event)
             return
+        self._process_event_type(dbevent)
+        self.event_session.add(dbevent)
 
         if event.event_type == EVENT_STATE_CHANGED:
             try:
                 dbstate = States.from_event(event)
+                shared_attrs = StateAttributes.shared_attrs_from_event(event)
+            except (TypeError, ValueError):
+                _LOGGER.warning(
+                    "State is not JSON serializable: %s",
+                    event.data.get("new_state"),
+                )
+            else:
+                self._process_state_attributes(dbstate, shared_attrs)
+                self._process_states_meta(dbstate)
                 has_new_state = event.data.get("new_state")
                 if dbstate.entity_id in self._old_states:
                     old_state = self._old_states.pop(dbstate.entity_id)
@@ -933,16 +1015,115 @@ class Recorder(threading.Thread):
                 if has_new_state:
                     self._old_states[dbstate.entity_id] = dbstate
                     self._pending_expunge.append(dbstate)
-            except (TypeError, ValueError):
-                _LOGGER.warning(
-                    "State is not JSON serializable: %s",
-                    event.data.get("new_state"),
-                )
 
-        # If they do not have a commit interval
-        # than we commit right away
-        if not self.commit_interval:
-            self._commit_event_session_or_retry()
+    def _add_event_to_bulk_writer(self, event):
+        """Add the event and its state as plain rows to the bulk writer."""
+        bulk_writer = self._bulk_writer
+        assert bulk_writer is not None
+        event_type = event.event_type
+        event_type_id = (
+            bulk_writer.pending_event_type_ids.get(event_type)
+            or self.event_type_ids.get_cached(event_type)
+            or bulk_writer.add_event_type(event_type)
+        )
+        try:
+            event_id = bulk_writer.add_event(event, event_type_id)
+        except (TypeError, ValueError):
+            _LOGGER.warning("Event is not JSON serializable: %s", event)
+            return
+
+        if event.event_type != EVENT_STATE_CHANGED:
+            return
+
+        try:
+            shared_attrs = StateAttributes.shared_attrs_from_event(event)
+        except (TypeError, ValueError):
+            _LOGGER.warning(
+                "State is not JSON serializable: %s",
+                event.data.get("new_state"),
+            )
+            return
+
+        # Matching attributes found in the pending commit or the cache
+        attributes_id = bulk_writer.pending_attributes_ids.get(
+            shared_attrs
+        ) or self._state_attributes_ids.get(shared_attrs)
+        if not attributes_id:
+            attr_hash = StateAttributes.hash_shared_attrs(shared_attrs)
+            # Matching attributes found in the database or
+            # no matching attributes found, save them in the DB
+            attributes_id = self._find_attributes_id(
+                shared_attrs, attr_hash
+            ) or bulk_writer.add_state_attributes(shared_attrs, attr_hash)
+        entity_id = event.data["entity_id"]
+        metadata_id = (
+            bulk_writer.pending_metadata_ids.get(entity_id)
+            or self.states_meta_ids.get_cached(entity_id)
+            or bulk_writer.add_states_meta(entity_id)
+        )
+        bulk_writer.add_state(event, event_id, attributes_id, metadata_id)
+
+    def _process_state_attributes(self, dbstate: States, shared_attrs: str) -> None:
+        """Link the state to an existing or new state_attributes row."""
+        # Matching attributes found in the pending commit
+        if pending_attributes := self._pending_state_attributes.get(shared_attrs):
+            dbstate.state_attributes = pending_attributes
+            return
+
+        # Matching attributes id found in the cache
+        if attributes_id := self._state_attributes_ids.get(shared_attrs):
+            dbstate.attributes_id = attributes_id
+            return
+
+        attr_hash = StateAttributes.hash_shared_attrs(shared_attrs)
+        # Matching attributes found in the database
+        if attributes_id := self._find_attributes_id(shared_attrs, attr_hash):
+            dbstate.attributes_id = attributes_id
+            return
+
+        # No matching attributes found, save them in the DB
+        dbstate_attributes = StateAttributes(shared_attrs=shared_attrs, hash=attr_hash)
+        dbstate.state_attributes = dbstate_attributes
+        self._pending_state_attributes[shared_attrs] = dbstate_attributes
+        self.event_session.add(dbstate_attributes)
+
+    def _process_event_type(self, dbevent: Events) -> None:
+        """Link the event to an existing or new event_types row."""
+        event_type = dbevent.event_type
+        if pending_event_type := self.event_type_ids.pending.get(event_type):
+            dbevent.event_types = pending_event_type
+        elif event_type_id := self.event_type_ids.get_cached(event_type):
+            dbevent.event_type_id = event_type_id
+        else:
+            dbevent_type = EventTypes(event_type=event_type)
+            dbevent.event_types = dbevent_type
+            self.event_type_ids.pending[event_type] = dbevent_type
+            self.event_session.add(dbevent_type)
+
+    def _process_states_meta(self, dbstate: States) -> None:
+        """Link the state to an existing or new states_meta row."""
+        entity_id = dbstate.entity_id
+        if pending_states_meta := self.states_meta_ids.pending.get(entity_id):
+            dbstate.states_meta = pending_states_meta
+        elif metadata_id := self.states_meta_ids.get_cached(entity_id):
+            dbstate.metadata_id = metadata_id
+        else:
+            dbstates_meta = StatesMeta(entity_id=entity_id)
+            dbstate.states_meta = dbstates_meta
+            self.states_meta_ids.pending[entity_id] = dbstates_meta
+            self.event_session.add(dbstates_meta)
+
+    def _find_attributes_id(self, shared_attrs: str, attr_hash: int) -> int | None:
+        """Find the id of matching attributes in the database and cache it."""
+        if attributes := (
+            self.event_session.query(StateAttributes.attributes_id)
+            .filter(StateAttributes.hash == attr_hash)
+            .filter(StateAttributes.shared_attrs == shared_attrs)
+            .first()
+        ):
+            self._state_attributes_ids[shared_attrs] = attributes[0]
+            return attributes[0]
+        return None
 
     def _handle_database_error(self, err):
         """Handle a database error that may result in moving away the corrupt db."""
@@ -956,7 +1137,11 @@ class Recorder(threading.Thread):
 
     def _commit_event_session_or_retry(self):
         """Commit the event session if there is work to do."""
-        if not self.event_session.new and not self.event_session.dirty:
+        if (
+            not self.event_session.new
+            and not self.event_session.dirty
+            and not (self._bulk_writer and self._bulk_writer.has_pending_rows)
+        ):
             return
         tries = 1
         while tries <= self.db_max_retries:
@@ -987,7 +1172,29 @@ class Recorder(threading.Thread):
                 if dbstate in self.event_session:
                     self.event_session.expunge(dbstate)
             self._pending_expunge = []
-        self.event_session.commit()
+
+        if self._bulk_writer is not None and self._bulk_writer.has_pending_rows:
+            try:
+                self._bulk_writer.write(self.event_session)
+                self.event_session.commit()
+            except SQLAlchemyError:
+                # Roll back the rows that were already written so
+                # the whole batch is written again when retrying
+                self.event_session.rollback()
+                raise
+            self._state_attributes_ids.update(self._bulk_writer.pending_attributes_ids)
+            self.states_meta_ids.update(self._bulk_writer.pending_metadata_ids)
+            self.event_type_ids.update(self._bulk_writer.pending_event_type_ids)
+            self._bulk_writer.clear()
+        else:
+            self.event_session.commit()
+
+        # Map the attributes_ids to avoid querying them again
+        for shared_attrs, attr in self._pending_state_attributes.items():
+            self._state_attributes_ids[shared_attrs] = attr.attributes_id
+        self._pending_state_attributes = {}
+        self.states_meta_ids.commit_pending()
+        self.event_type_ids.commit_pending()
 
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
@@ -1007,6 +1214,12 @@ class Recorder(threading.Thread):
     def _close_event_session(self):
         """Close the event session."""
         self._old_states = {}
+        self._state_attributes_ids.clear()
+        self._pending_state_attributes = {}
+        self.states_meta_ids.pending = {}
+        self.event_type_ids.pending = {}
+        if self._bulk_writer is not None:
+            self._bulk_writer.reset()
 
         if not self.event_session:
             return
@@ -1028,6 +1241,13 @@ class Recorder(threading.Thread):
         """Open the event session."""
         self.event_session = self.get_session()
         self.event_session.expire_on_commit = False
+        if self._bulk_writer is not None:
+            self._bulk_writer.load_ids(self.event_session)
+
+    def commit_pending_bulk_rows(self):
+        """Commit the rows of the bulk writer before a task modifies them."""
+        if self._bulk_writer is not None:
+            self._commit_event_session_or_retry()
 
     def _send_keep_alive(self):
         """Send a keep alive to keep the db connection open."""
@@ -1039,6 +1259,11 @@ class Recorder(threading.Thread):
         """Listen for new events and put them in the process queue."""
         self.queue.put(EventTask(event))
 
+    @callback
+    def _async_tick_listener(self, now):
+        """Put the timer tick in the process queue."""
+        self.queue.put(TickTask())
+
     def block_till_done(self):
         """Block till all events processed.
 
@@ -1055,6 +1280,16 @@ class Recorder(threading.Thread):
         self.queue.put(WaitTask())
         self._queue_watch.wait()
 
+    async def async_block_till_done(self) -> None:
+        """Wait until the events fired so far have been committed.
+
+        Readers call this before querying recent events so the
+        recorder commit interval does not hide them.
+        """
+        event = asyncio.Event()
+        self.queue.put(SynchronizeTask(event))
+        await event.wait()
+
     async def lock_database(self) -> bool:
         """Lock database so it can be backed up safely."""
         if not self.engine or self.engine.dialect.name != "sqlite":
@@ -1153,6 +1388,7 @@ class Recorder(threading.Thread):
 
     def _setup_run(self):
         """Log the start of the current run and schedule any needed jobs."""
+        self._setup_bulk_writer()
         with session_scope(session=self.get_session()) as session:
             start = self.recording_start
             end_incomplete_runs(session, start)
@@ -1161,9 +1397,25 @@ class Recorder(threading.Thread):
             session.flush()
             session.expunge(self.run_info)
             self._schedule_compile_missing_statistics(session)
+            self.states_meta_ids.load(session)
+            self.event_type_ids.load(session)
 
         self._open_event_session()
 
+    def _setup_bulk_writer(self):
+        """Set up the bulk writer if enabled and supported by the database."""
+        if not self._bulk_insert:
+            return
+        if self.engine.dialect.name not in BULK_INSERT_DIALECTS:
+            _LOGGER.warning(
+                "Bulk insert is not supported for %s databases, falling back "
+                "to the default insert mode",
+                self.engine.dialect.name,
+            )
+            self._bulk_writer = None
+            return
+        self._bulk_writer = BulkWriter()
+
     def _schedule_compile_missing_statistics(self, session: Session) -> None:
         """Add tasks for missing statistics runs."""
         now = dt_util.utcnow()
@@ -0,0 +1,193 @@
+"""Bulk insert support for the recorder commit loop."""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from sqlalchemy import func
+from sqlalchemy.orm.session import Session
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, split_entity_id
+from homeassistant.helpers.json import JSONEncoder
+
+from .models import Events, EventTypes, StateAttributes, States, StatesMeta
+
+# Dialects that accept explicit values for identity columns
+# and keep their own counters in sync with them
+BULK_INSERT_DIALECTS = {"sqlite", "mysql"}
+
+
+class BulkWriter:
+    """Collect recorder rows as plain dicts and write them in bulk.
+
+    Primary keys are allocated in memory so the rows can be linked
+    without a round trip to the database, and each table is written
+    with a single executemany per commit.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the bulk writer."""
+        self.old_state_ids: dict[str, int] = {}
+        self.pending_attributes_ids: dict[str, int] = {}
+        self.pending_metadata_ids: dict[str, int] = {}
+        self.pending_event_type_ids: dict[str, int] = {}
+        self._events: list[dict[str, Any]] = []
+        self._states: list[dict[str, Any]] = []
+        self._state_attributes: list[dict[str, Any]] = []
+        self._states_meta: list[dict[str, Any]] = []
+        self._event_types: list[dict[str, Any]] = []
+        self._next_event_id = 0
+        self._next_state_id = 0
+        self._next_attributes_id = 0
+        self._next_metadata_id = 0
+        self._next_event_type_id = 0
+
+    @property
+    def has_pending_rows(self) -> bool:
+        """Return if there are rows waiting to be written."""
+        return bool(self._events)
+
+    def load_ids(self, session: Session) -> None:
+        """Load the last used ids from the database."""
+        self._next_event_id = _max_id(session, Events.event_id)
+        self._next_state_id = _max_id(session, States.state_id)
+        self._next_attributes_id = _max_id(session, StateAttributes.attributes_id)
+        self._next_metadata_id = _max_id(session, StatesMeta.metadata_id)
+        self._next_event_type_id = _max_id(session, EventTypes.event_type_id)
+
+    def reset(self) -> None:
+        """Drop all pending rows and cached links."""
+        self.old_state_ids = {}
+        self.clear()
+
+    def add_event(self, event: Event, event_type_id: int) -> int:
+        """Add an event row and return its event_id.
+
+        Raises TypeError or ValueError if the event data
+        is not JSON serializable.
+        """
+        if event.event_type == EVENT_STATE_CHANGED:
+            event_data = "{}"
+        else:
+            event_data = json.dumps(event.data, cls=JSONEncoder, separators=(",", ":"))
+        self._next_event_id += 1
+        context = event.context
+        self._events.append(
+            {
+                "event_id": self._next_event_id,
+                "event_type": event.event_type,
+                "event_type_id": event_type_id,
+                "event_data": event_data,
+                "origin": str(event.origin.value),
+                "time_fired": event.time_fired,
+                "time_fired_ts": event.time_fired.timestamp(),
+                "created": event.time_fired,
+                "context_id": context.id,
+                "context_user_id": context.user_id,
+                "context_parent_id": context.parent_id,
+            }
+        )
+        return self._next_event_id
+
+    def add_state_attributes(self, shared_attrs: str, attr_hash: int) -> int:
+        """Add a state attributes row and return its attributes_id."""
+        self._next_attributes_id += 1
+        self._state_attributes.append(
+            {
+                "attributes_id": self._next_attributes_id,
+                "hash": attr_hash,
+                "shared_attrs": shared_attrs,
+            }
+        )
+        self.pending_attributes_ids[shared_attrs] = self._next_attributes_id
+        return self._next_attributes_id
+
+    def add_states_meta(self, entity_id: str) -> int:
+        """Add a states meta row and return its metadata_id."""
+        self._next_metadata_id += 1
+        self._states_meta.append(
+            {"metadata_id": self._next_metadata_id, "entity_id": entity_id}
+        )
+        self.pending_metadata_ids[entity_id] = self._next_metadata_id
+        return self._next_metadata_id
+
+    def add_event_type(self, event_type: str) -> int:
+        """Add an event type row and return its event_type_id."""
+        self._next_event_type_id += 1
+        self._event_types.append(
+            {"event_type_id": self._next_event_type_id, "event_type": event_type}
+        )
+        self.pending_event_type_ids[event_type] = self._next_event_type_id
+        return self._next_event_type_id
+
+    def add_state(
+        self, event: Event, event_id: int, attributes_id: int, metadata_id: int
+    ) -> None:
+        """Add a state row for a state_changed event."""
+        self._next_state_id += 1
+        entity_id = event.data["entity_id"]
+        row = {
+            "state_id": self._next_state_id,
+            "entity_id": entity_id,
+            "attributes": None,
+            "event_id": event_id,
+            "created": event.time_fired,
+            "old_state_id": self.old_state_ids.pop(entity_id, None),
+            "attributes_id": attributes_id,
+            "metadata_id": metadata_id,
+        }
+        # State got deleted
+        if (state := event.data.get("new_state")) is None:
+            row["domain"] = split_entity_id(entity_id)[0]
+            row["state"] = None
+            row["last_changed"] = event.time_fired
+            row["last_updated"] = event.time_fired
+            row["last_changed_ts"] = row[
+                "last_updated_ts"
+            ] = event.time_fired.timestamp()
+        else:
+            row["domain"] = state.domain
+            row["state"] = state.state
+            row["last_changed"] = state.last_changed
+            row["last_updated"] = state.last_updated
+            row["last_changed_ts"] = state.last_changed.timestamp()
+            row["last_updated_ts"] = state.last_updated.timestamp()
+            self.old_state_ids[entity_id] = self._next_state_id
+        self._states.append(row)
+
+    def evict_purged_state_ids(self, purged_state_ids: set[int]) -> None:
+        """Drop links to purged states."""
+        for entity_id, state_id in list(self.old_state_ids.items()):
+            if state_id in purged_state_ids:
+                del self.old_state_ids[entity_id]
+
+    def write(self, session: Session) -> None:
+        """Write the pending rows with one executemany per table."""
+        connection = session.connection()
+        # Order matters to satisfy the foreign key constraints
+        for table, rows in (
+            (StateAttributes.__table__, self._state_attributes),
+            (StatesMeta.__table__, self._states_meta),
+            (EventTypes.__table__, self._event_types),
+            (Events.__table__, self._events),
+            (States.__table__, self._states),
+        ):
+            if rows:
+                connection.execute(table.insert(), rows)
+
+    def clear(self) -> None:
+        """Drop the pending rows once written."""
+        self.pending_attributes_ids = {}
+        self.pending_metadata_ids = {}
+        self.pending_event_type_ids = {}
+        self._events = []
+        self._states = []
+        self._state_attributes = []
+        self._states_meta = []
+        self._event_types = []
+
+
+def _max_id(session: Session, column: Any) -> int:
+    """Return the highest id in use for a column."""
+    return session.query(func.max(column)).scalar() or 0
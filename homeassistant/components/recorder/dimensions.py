@@ -0,0 +1,65 @@
+"""In-memory id maps for the recorder dimension tables."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy.orm.session import Session
+
+
+class DimensionIdMap:
+    """Map the values of a dimension table to their integer ids.
+
+    Rows are never removed from the dimension tables so an id stays
+    valid for the lifetime of the database. The map is warmed when the
+    recorder run is set up and the recorder thread is the only writer,
+    so it can trust get_cached. Lookups from other threads fall back
+    to the database and only cache committed ids.
+    """
+
+    def __init__(self, model: Any, value_attr: str, id_attr: str) -> None:
+        """Initialize the id map."""
+        self._value_column = getattr(model, value_attr)
+        self._id_column = getattr(model, id_attr)
+        self._id_attr = id_attr
+        self._ids: dict[str, int] = {}
+        self.pending: dict[str, Any] = {}
+
+    def load(self, session: Session) -> None:
+        """Warm the map with all the rows of the dimension table."""
+        self._ids = dict(session.query(self._value_column, self._id_column))
+        self.pending = {}
+
+    def get_cached(self, value: str) -> int | None:
+        """Return the id of a value if it is in the map."""
+        return self._ids.get(value)
+
+    def get(self, session: Session, value: str) -> int | None:
+        """Return the id of a value, or None if it is not in the table."""
+        return self.get_many(session, (value,))[value]
+
+    def get_many(
+        self, session: Session, values: Iterable[str]
+    ) -> dict[str, int | None]:
+        """Return the ids of the values, querying the database on a cache miss."""
+        ids = {value: self._ids.get(value) for value in values}
+        if missing := [value for value, id_ in ids.items() if id_ is None]:
+            for value, id_ in session.query(self._value_column, self._id_column).filter(
+                self._value_column.in_(missing)
+            ):
+                ids[value] = self._ids[value] = id_
+        return ids
+
+    def get_ids(self, session: Session, values: Iterable[str]) -> list[int]:
+        """Return the ids of the values that are in the table."""
+        return [id_ for id_ in self.get_many(session, values).values() if id_]
+
+    def update(self, ids: dict[str, int]) -> None:
+        """Add committed ids to the map."""
+        self._ids.update(ids)
+
+    def commit_pending(self) -> None:
+        """Map the pending rows to their ids once they have been committed."""
+        for value, row in self.pending.items():
+            self._ids[value] = getattr(row, self._id_attr)
+        self.pending = {}
@@ -13,7 +13,8 @@ from homeassistant.components import recorder
 from homeassistant.core import split_entity_id
 import homeassistant.util.dt as dt_util
 
-from .models import LazyState, States, process_timestamp_to_utc_isoformat
+from .const import DATA_INSTANCE
+from .models import LazyState, StateAttributes, States, timestamp_to_utc_isoformat
 from .util import execute, session_scope
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
@@ -44,12 +45,16 @@ QUERY_STATES = [
     States.entity_id,
     States.state,
     States.attributes,
-    States.last_changed,
-    States.last_updated,
+    StateAttributes.shared_attrs,
+    States.last_changed_ts,
+    States.last_updated_ts,
 ]
 
 HISTORY_BAKERY = "recorder_history_bakery"
 
+# Number of rows fetched at a time when streaming the history
+STREAM_BATCH_SIZE = 1000
+
 
 def async_setup(hass):
     """Set up the history hooks."""
@@ -72,6 +77,7 @@ def get_significant_states_with_session(
     include_start_time_state=True,
     significant_changes_only=True,
     minimal_response=False,
+    epoch_timestamps=False,
 ):
     """
     Return states changes during UTC period start_time - end_time.
@@ -84,12 +90,143 @@ def get_significant_states_with_session(
     Significant states are all states where there is a state change,
     as well as all states from certain domains (for instance
     thermostat so that we get current temperature in our graphs).
+
+    With epoch_timestamps the minimal states have their last_changed as an
+    epoch timestamp instead of a UTC isotime.
     """
     timer_start = time.perf_counter()
 
+    metadata_ids = None
+    if entity_ids is not None:
+        metadata_ids = _metadata_ids_for_entity_ids(hass, session, entity_ids)
+
+    states = execute(
+        _significant_states_query(
+            hass,
+            session,
+            start_time,
+            end_time,
+            metadata_ids,
+            filters,
+            significant_changes_only,
+        )
+    )
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_significant_states took %fs", elapsed)
+
+    return _sorted_states_to_dict(
+        hass,
+        session,
+        states,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        minimal_response,
+        epoch_timestamps,
+    )
+
+
+def iter_significant_states_with_session(
+    hass,
+    session,
+    start_time,
+    end_time=None,
+    entity_ids=None,
+    filters=None,
+    include_start_time_state=True,
+    significant_changes_only=True,
+    minimal_response=False,
+    epoch_timestamps=False,
+):
+    """
+    Yield the states changes of each entity during UTC period start_time - end_time.
+
+    This is the streaming variant of get_significant_states_with_session.
+    It yields (entity_id, states) pairs where states is an iterator, and
+    fetches the rows in batches of STREAM_BATCH_SIZE, so the session must
+    stay open and each states iterator must be exhausted before advancing.
+
+    Entities are yielded in the order of entity_ids when it is given,
+    otherwise the entities with state changes come first ordered by
+    entity_id, followed by the entities that only have a start time state.
+    """
+    start_states = {}
+    if include_start_time_state:
+        run = recorder.run_information_from_instance(hass, start_time)
+        for state in _get_states_with_session(
+            hass, session, start_time, entity_ids, run=run, filters=filters
+        ):
+            state.last_changed = start_time
+            state.last_updated = start_time
+            start_states[state.entity_id] = state
+
+    if entity_ids is None:
+        rows = _significant_states_query(
+            hass, session, start_time, end_time, None, filters, significant_changes_only
+        ).with_post_criteria(lambda q: q.yield_per(STREAM_BATCH_SIZE))
+        for ent_id, group in groupby(rows, lambda state: state.entity_id):
+            start_state = start_states.pop(ent_id, None)
+            yield ent_id, _chain_start_state(
+                start_state,
+                _iter_entity_states(
+                    ent_id, start_state, group, minimal_response, epoch_timestamps
+                ),
+            )
+        for ent_id, start_state in start_states.items():
+            yield ent_id, iter((start_state,))
+        return
+
+    # One indexed query per entity keeps the requested order
+    # without holding the states of the other entities
+    for ent_id in entity_ids:
+        start_state = start_states.get(ent_id)
+        if (metadata_id := _metadata_id_for_entity_id(hass, session, ent_id)) is None:
+            continue
+        rows = _significant_states_query(
+            hass,
+            session,
+            start_time,
+            end_time,
+            [metadata_id],
+            filters,
+            significant_changes_only,
+        ).with_post_criteria(lambda q: q.yield_per(STREAM_BATCH_SIZE))
+        states = _iter_entity_states(
+            ent_id, start_state, iter(rows), minimal_response, epoch_timestamps
+        )
+        if start_state is None:
+            if (first := next(states, None)) is None:
+                continue
+            start_state = first
+        yield ent_id, _chain_start_state(start_state, states)
+
+
+def _chain_start_state(start_state, states):
+    """Prepend the start time state, if any, to the states of an entity."""
+    if start_state is not None:
+        yield start_state
+    yield from states
+
+
+def _significant_states_query(
+    hass,
+    session,
+    start_time,
+    end_time,
+    metadata_ids,
+    filters,
+    significant_changes_only,
+):
+    """Return the query for the significant states ordered by entity and time."""
     baked_query = hass.data[HISTORY_BAKERY](
         lambda session: session.query(*QUERY_STATES)
     )
+    baked_query += lambda q: q.outerjoin(
+        StateAttributes, States.attributes_id == StateAttributes.attributes_id
+    )
 
     if significant_changes_only:
         baked_query += lambda q: q.filter(
@@ -102,9 +239,9 @@ def get_significant_states_with_session(
     else:
         baked_query += lambda q: q.filter(States.last_updated > bindparam("start_time"))
 
-    if entity_ids is not None:
+    if metadata_ids is not None:
         baked_query += lambda q: q.filter(
-            States.entity_id.in_(bindparam("entity_ids", expanding=True))
+            States.metadata_id.in_(bindparam("metadata_ids", expanding=True))
         )
     else:
         baked_query += lambda q: q.filter(~States.domain.in_(IGNORE_DOMAINS))
@@ -116,25 +253,8 @@ def get_significant_states_with_session(
 
     baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
 
-    states = execute(
-        baked_query(session).params(
-            start_time=start_time, end_time=end_time, entity_ids=entity_ids
-        )
-    )
-
-    if _LOGGER.isEnabledFor(logging.DEBUG):
-        elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("get_significant_states took %fs", elapsed)
-
-    return _sorted_states_to_dict(
-        hass,
-        session,
-        states,
-        start_time,
-        entity_ids,
-        filters,
-        include_start_time_state,
-        minimal_response,
+    return baked_query(session).params(
+        start_time=start_time, end_time=end_time, metadata_ids=metadata_ids
     )
 
 
@@ -144,6 +264,9 @@ def state_changes_during_period(hass, start_time, end_time=None, entity_id=None)
         baked_query = hass.data[HISTORY_BAKERY](
             lambda session: session.query(*QUERY_STATES)
         )
+        baked_query += lambda q: q.outerjoin(
+            StateAttributes, States.attributes_id == StateAttributes.attributes_id
+        )
 
         baked_query += lambda q: q.filter(
             (States.last_changed == States.last_updated)
@@ -155,15 +278,19 @@ def state_changes_during_period(hass, start_time, end_time=None, entity_id=None)
                 States.last_updated < bindparam("end_time")
             )
 
+        metadata_id = None
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.metadata_id == bindparam("metadata_id")
+            )
             entity_id = entity_id.lower()
+            metadata_id = _metadata_id_for_entity_id(hass, session, entity_id)
 
         baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
 
         states = execute(
             baked_query(session).params(
-                start_time=start_time, end_time=end_time, entity_id=entity_id
+                start_time=start_time, end_time=end_time, metadata_id=metadata_id
             )
         )
 
@@ -180,11 +307,18 @@ def get_last_state_changes(hass, number_of_states, entity_id):
         baked_query = hass.data[HISTORY_BAKERY](
             lambda session: session.query(*QUERY_STATES)
         )
+        baked_query += lambda q: q.outerjoin(
+            StateAttributes, States.attributes_id == StateAttributes.attributes_id
+        )
         baked_query += lambda q: q.filter(States.last_changed == States.last_updated)
 
+        metadata_id = None
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.metadata_id == bindparam("metadata_id")
+            )
             entity_id = entity_id.lower()
+            metadata_id = _metadata_id_for_entity_id(hass, session, entity_id)
 
         baked_query += lambda q: q.order_by(
             States.entity_id, States.last_updated.desc()
@@ -194,7 +328,7 @@ def get_last_state_changes(hass, number_of_states, entity_id):
 
         states = execute(
             baked_query(session).params(
-                number_of_states=number_of_states, entity_id=entity_id
+                number_of_states=number_of_states, metadata_id=metadata_id
             )
         )
 
@@ -256,9 +390,13 @@ def _get_states_with_session(
                 (States.last_updated >= run.start)
                 & (States.last_updated < utc_point_in_time)
             )
-            .filter(States.entity_id.in_(entity_ids))
+            .filter(
+                States.metadata_id.in_(
+                    _metadata_ids_for_entity_ids(hass, session, entity_ids)
+                )
+            )
         )
-        most_recent_state_ids = most_recent_state_ids.group_by(States.entity_id)
+        most_recent_state_ids = most_recent_state_ids.group_by(States.metadata_id)
         most_recent_state_ids = most_recent_state_ids.subquery()
         query = query.join(
             most_recent_state_ids,
@@ -271,14 +409,14 @@ def _get_states_with_session(
         # not indexed and we can't control what's in the custom filter.
         most_recent_states_by_date = (
             session.query(
-                States.entity_id.label("max_entity_id"),
+                States.metadata_id.label("max_metadata_id"),
                 func.max(States.last_updated).label("max_last_updated"),
             )
             .filter(
                 (States.last_updated >= run.start)
                 & (States.last_updated < utc_point_in_time)
             )
-            .group_by(States.entity_id)
+            .group_by(States.metadata_id)
             .subquery()
         )
         most_recent_state_ids = (
@@ -286,12 +424,12 @@ def _get_states_with_session(
             .join(
                 most_recent_states_by_date,
                 and_(
-                    States.entity_id == most_recent_states_by_date.c.max_entity_id,
+                    States.metadata_id == most_recent_states_by_date.c.max_metadata_id,
                     States.last_updated
                     == most_recent_states_by_date.c.max_last_updated,
                 ),
             )
-            .group_by(States.entity_id)
+            .group_by(States.metadata_id)
             .subquery()
         )
         query = query.join(
@@ -302,6 +440,11 @@ def _get_states_with_session(
         if filters:
             query = filters.apply(query)
 
+    query = query.outerjoin(
+        StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+    )
+    # Return the states sorted by entity_id
+    query = query.order_by(States.entity_id)
     return [LazyState(row) for row in execute(query)]
 
 
@@ -311,20 +454,34 @@ def _get_single_entity_states_with_session(hass, session, utc_point_in_time, ent
     baked_query = hass.data[HISTORY_BAKERY](
         lambda session: session.query(*QUERY_STATES)
     )
+    baked_query += lambda q: q.outerjoin(
+        StateAttributes, States.attributes_id == StateAttributes.attributes_id
+    )
     baked_query += lambda q: q.filter(
         States.last_updated < bindparam("utc_point_in_time"),
-        States.entity_id == bindparam("entity_id"),
+        States.metadata_id == bindparam("metadata_id"),
     )
     baked_query += lambda q: q.order_by(States.last_updated.desc())
     baked_query += lambda q: q.limit(1)
 
     query = baked_query(session).params(
-        utc_point_in_time=utc_point_in_time, entity_id=entity_id
+        utc_point_in_time=utc_point_in_time,
+        metadata_id=_metadata_id_for_entity_id(hass, session, entity_id),
     )
 
     return [LazyState(row) for row in execute(query)]
 
 
+def _metadata_ids_for_entity_ids(hass, session, entity_ids):
+    """Return the states_meta ids of the recorded entity ids."""
+    return hass.data[DATA_INSTANCE].states_meta_ids.get_ids(session, entity_ids)
+
+
+def _metadata_id_for_entity_id(hass, session, entity_id):
+    """Return the states_meta id of an entity id, or None if it is not recorded."""
+    return hass.data[DATA_INSTANCE].states_meta_ids.get(session, entity_id)
+
+
 def _sorted_states_to_dict(
     hass,
     session,
@@ -334,6 +491,7 @@ def _sorted_states_to_dict(
     filters=None,
     include_start_time_state=True,
     minimal_response=False,
+    epoch_timestamps=False,
 ):
     """Convert SQL results into JSON friendly data structure.
 
@@ -367,53 +525,75 @@ def _sorted_states_to_dict(
         elapsed = time.perf_counter() - timer_start
         _LOGGER.debug("getting %d first datapoints took %fs", len(result), elapsed)
 
-    # Called in a tight loop so cache the function
-    # here
-    _process_timestamp_to_utc_isoformat = process_timestamp_to_utc_isoformat
-
     # Append all changes to it
     for ent_id, group in groupby(states, lambda state: state.entity_id):
-        domain = split_entity_id(ent_id)[0]
         ent_results = result[ent_id]
-        if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
-            ent_results.extend(LazyState(db_state) for db_state in group)
-
-        # With minimal response we only provide a native
-        # State for the first and last response. All the states
-        # in-between only provide the "state" and the
-        # "last_changed".
-        if not ent_results:
-            ent_results.append(LazyState(next(group)))
-
-        prev_state = ent_results[-1]
-        initial_state_count = len(ent_results)
-
-        for db_state in group:
-            # With minimal response we do not care about attribute
-            # changes so we can filter out duplicate states
-            if db_state.state == prev_state.state:
-                continue
-
-            ent_results.append(
-                {
-                    STATE_KEY: db_state.state,
-                    LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
-                        db_state.last_changed
-                    ),
-                }
+        ent_results.extend(
+            _iter_entity_states(
+                ent_id,
+                ent_results[-1] if ent_results else None,
+                group,
+                minimal_response,
+                epoch_timestamps,
             )
-            prev_state = db_state
-
-        if prev_state and len(ent_results) != initial_state_count:
-            # There was at least one state change
-            # replace the last minimal state with
-            # a full state
-            ent_results[-1] = LazyState(prev_state)
+        )
 
     # Filter out the empty lists if some states had 0 results.
     return {key: val for key, val in result.items() if val}
 
 
+def _iter_entity_states(
+    entity_id, prev_state, db_states, minimal_response, epoch_timestamps
+):
+    """Yield the states of an entity that follow prev_state.
+
+    db_states must be sorted by last_updated and prev_state is
+    the start time state of the entity, if there is one.
+    """
+    if not minimal_response or split_entity_id(entity_id)[0] in NEED_ATTRIBUTE_DOMAINS:
+        for db_state in db_states:
+            yield LazyState(db_state)
+        return
+
+    # With minimal response we only provide a native
+    # State for the first and last response. All the states
+    # in-between only provide the "state" and the
+    # "last_changed".
+    if prev_state is None:
+        if (prev_state := next(db_states, None)) is None:
+            return
+        yield LazyState(prev_state)
+
+    # Called in a tight loop so cache the function
+    # here
+    _timestamp_to_utc_isoformat = timestamp_to_utc_isoformat
+
+    # The latest minimal state is held back until the next state
+    # change so the last one can be replaced with a full state
+    minimal_state = None
+    for db_state in db_states:
+        # With minimal response we do not care about attribute
+        # changes so we can filter out duplicate states
+        if db_state.state == prev_state.state:
+            continue
+
+        if minimal_state is not None:
+            yield minimal_state
+        minimal_state = {
+            STATE_KEY: db_state.state,
+            LAST_CHANGED_KEY: db_state.last_changed_ts
+            if epoch_timestamps
+            else _timestamp_to_utc_isoformat(db_state.last_changed_ts),
+        }
+        prev_state = db_state
+
+    if minimal_state is not None:
+        # There was at least one state change
+        # replace the last minimal state with
+        # a full state
+        yield LazyState(prev_state)
+
+
 def get_state(hass, utc_point_in_time, entity_id, run=None):
     """Return a state at a specific point in time."""
     states = get_states(hass, utc_point_in_time, (entity_id,), run)
@@ -4,7 +4,7 @@ from datetime import timedelta
 import logging
 
 import sqlalchemy
-from sqlalchemy import ForeignKeyConstraint, MetaData, Table, func, text
+from sqlalchemy import ForeignKeyConstraint, MetaData, Table, bindparam, func, text
 from sqlalchemy.exc import (
     DatabaseError,
     InternalError,
@@ -19,7 +19,9 @@ from .models import (
     SCHEMA_VERSION,
     TABLE_STATES,
     Base,
+    Events,
     SchemaChanges,
+    States,
     Statistics,
     StatisticsMeta,
     StatisticsRuns,
@@ -31,6 +33,8 @@ from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+TIMESTAMP_MIGRATION_BATCH_SIZE = 10000
+
 
 def raise_if_exception_missing_str(ex, match_substrs):
     """Raise an exception if the exception and cause do not contain the match substrs."""
@@ -638,11 +642,107 @@ def _apply_update(instance, new_version, old_version):  # noqa: C901
                 "statistics_short_term",
                 "ix_statistics_short_term_statistic_id_start",
             )
+    elif new_version == 25:
+        # The state_attributes table is created by create_all, link
+        # the states table to it
+        _add_columns(instance, "states", ["attributes_id INTEGER"])
+        _create_index(instance, "states", "ix_states_attributes_id")
+    elif new_version == 26:
+        # The states_meta and event_types tables are created by create_all,
+        # link the states and events tables to them
+        _add_columns(instance, "states", ["metadata_id INTEGER"])
+        _add_columns(instance, "events", ["event_type_id INTEGER"])
+        with session_scope(session=instance.get_session()) as session:
+            connection = session.connection()
+            connection.execute(
+                text(
+                    "INSERT INTO states_meta (entity_id) "
+                    "SELECT DISTINCT entity_id FROM states WHERE entity_id IS NOT NULL"
+                )
+            )
+            connection.execute(
+                text(
+                    "UPDATE states SET metadata_id = (SELECT metadata_id "
+                    "FROM states_meta WHERE states_meta.entity_id = states.entity_id)"
+                )
+            )
+            connection.execute(
+                text(
+                    "INSERT INTO event_types (event_type) "
+                    "SELECT DISTINCT event_type FROM events WHERE event_type IS NOT NULL"
+                )
+            )
+            connection.execute(
+                text(
+                    "UPDATE events SET event_type_id = (SELECT event_type_id "
+                    "FROM event_types WHERE event_types.event_type = events.event_type)"
+                )
+            )
+        _drop_index(instance, "states", "ix_states_entity_id_last_updated")
+        _create_index(instance, "states", "ix_states_metadata_id_last_updated")
+        _drop_index(instance, "events", "ix_events_event_type_time_fired")
+        _create_index(instance, "events", "ix_events_event_type_id_time_fired")
+    elif new_version == 27:
+        _add_columns(
+            instance,
+            "states",
+            ["last_changed_ts DOUBLE PRECISION", "last_updated_ts DOUBLE PRECISION"],
+        )
+        _add_columns(instance, "events", ["time_fired_ts DOUBLE PRECISION"])
+        _migrate_timestamp_columns(
+            instance,
+            States.__table__,
+            States.state_id,
+            {
+                "last_changed_ts": States.last_changed,
+                "last_updated_ts": States.last_updated,
+            },
+        )
+        _migrate_timestamp_columns(
+            instance,
+            Events.__table__,
+            Events.event_id,
+            {"time_fired_ts": Events.time_fired},
+        )
 
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
 
+def _migrate_timestamp_columns(instance, table, id_column, columns):
+    """Fill the epoch timestamp columns from the datetime columns in batches."""
+    ts_column, dt_column = next(iter(columns.items()))
+    update = (
+        table.update()
+        .where(id_column == bindparam("_id"))
+        .values({name: bindparam(name) for name in columns})
+    )
+    while True:
+        with session_scope(session=instance.get_session()) as session:
+            rows = (
+                session.query(id_column, *columns.values())
+                .filter(table.c[ts_column].is_(None))
+                .filter(dt_column.isnot(None))
+                .limit(TIMESTAMP_MIGRATION_BATCH_SIZE)
+                .all()
+            )
+            if not rows:
+                return
+            session.connection().execute(
+                update,
+                [
+                    {
+                        "_id": row[0],
+                        **{
+                            name: dt_value and process_timestamp(dt_value).timestamp()
+                            for name, dt_value in zip(columns, row[1:])
+                        },
+                    }
+                    for row in rows
+                ],
+            )
+
+
 def _inspect_schema_version(engine, session):
     """Determine the schema version by inspecting the db structure.
 
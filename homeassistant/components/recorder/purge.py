@@ -6,12 +6,21 @@ from datetime import datetime
 import logging
 from typing import TYPE_CHECKING
 
-from sqlalchemy import func
+from sqlalchemy import exists, func
 from sqlalchemy.orm.session import Session
 from sqlalchemy.sql.expression import distinct
 
 from .const import MAX_ROWS_TO_PURGE
-from .models import Events, RecorderRuns, States, StatisticsRuns, StatisticsShortTerm
+from .models import (
+    Events,
+    EventTypes,
+    RecorderRuns,
+    StateAttributes,
+    States,
+    StatesMeta,
+    StatisticsRuns,
+    StatisticsShortTerm,
+)
 from .repack import repack_database
 from .util import retryable_database_job, session_scope
 
@@ -37,7 +46,9 @@ def purge_old_data(
     with session_scope(session=instance.get_session()) as session:  # type: ignore
         # Purge a max of MAX_ROWS_TO_PURGE, based on the oldest states or events record
         event_ids = _select_event_ids_to_purge(session, purge_before)
-        state_ids = _select_state_ids_to_purge(session, purge_before, event_ids)
+        state_ids, attributes_ids = _select_state_and_attributes_ids_to_purge(
+            session, purge_before, event_ids
+        )
         statistics_runs = _select_statistics_runs_to_purge(session, purge_before)
         short_term_statistics = _select_short_term_statistics_to_purge(
             session, purge_before
@@ -46,6 +57,11 @@ def purge_old_data(
         if state_ids:
             _purge_state_ids(instance, session, state_ids)
 
+        if unused_attributes_ids := _select_unused_attributes_ids(
+            session, attributes_ids
+        ):
+            _purge_attributes_ids(instance, session, unused_attributes_ids)
+
         if event_ids:
             _purge_event_ids(session, event_ids)
 
@@ -82,20 +98,48 @@ def _select_event_ids_to_purge(session: Session, purge_before: datetime) -> list
     return [event.event_id for event in events]
 
 
-def _select_state_ids_to_purge(
+def _select_state_and_attributes_ids_to_purge(
     session: Session, purge_before: datetime, event_ids: list[int]
-) -> set[int]:
-    """Return a list of state ids to purge."""
+) -> tuple[set[int], set[int]]:
+    """Return a list of state ids and attributes ids to purge."""
     if not event_ids:
-        return set()
+        return set(), set()
     states = (
-        session.query(States.state_id)
+        session.query(States.state_id, States.attributes_id)
         .filter(States.last_updated < purge_before)
         .filter(States.event_id.in_(event_ids))
         .all()
     )
     _LOGGER.debug("Selected %s state ids to remove", len(states))
-    return {state.state_id for state in states}
+    state_ids = set()
+    attributes_ids = set()
+    for state in states:
+        state_ids.add(state.state_id)
+        if state.attributes_id:
+            attributes_ids.add(state.attributes_id)
+    return state_ids, attributes_ids
+
+
+def _select_unused_attributes_ids(
+    session: Session, attributes_ids: set[int]
+) -> set[int]:
+    """Return a set of attributes ids that are not used by any states in the database."""
+    if not attributes_ids:
+        return set()
+    attributes_ids_still_in_use = {
+        state.attributes_id
+        for state in session.query(
+            distinct(States.attributes_id).label("attributes_id")
+        )
+        .filter(States.attributes_id.in_(attributes_ids))
+        .all()
+    }
+    to_remove = attributes_ids - attributes_ids_still_in_use
+    _LOGGER.debug(
+        "Selected %s shared attributes to remove",
+        len(to_remove),
+    )
+    return to_remove
 
 
 def _select_statistics_runs_to_purge(
@@ -174,6 +218,47 @@ def _evict_purged_states_from_old_states_cache(
     for purged_state_id in purged_state_ids.intersection(old_state_reversed):
         old_states.pop(old_state_reversed[purged_state_id], None)
 
+    # pylint: disable-next=protected-access
+    if (bulk_writer := instance._bulk_writer) is not None:
+        bulk_writer.evict_purged_state_ids(purged_state_ids)
+
+
+def _purge_attributes_ids(
+    instance: Recorder, session: Session, attributes_ids: set[int]
+) -> None:
+    """Delete old attributes ids."""
+    deleted_rows = (
+        session.query(StateAttributes)
+        .filter(StateAttributes.attributes_id.in_(attributes_ids))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s attribute states", deleted_rows)
+
+    # Evict any entries in the state_attributes_ids cache referring to a purged state
+    _evict_purged_attributes_from_attributes_cache(instance, attributes_ids)
+
+
+def _evict_purged_attributes_from_attributes_cache(
+    instance: Recorder, purged_attributes_ids: set[int]
+) -> None:
+    """Evict purged attribute ids from the attribute ids cache."""
+    # Make a map from attributes_id to shared_attrs
+    state_attributes_ids = (
+        instance._state_attributes_ids  # pylint: disable=protected-access
+    )
+    state_attributes_ids_reversed = {
+        attributes_id: shared_attrs
+        for shared_attrs, attributes_id in state_attributes_ids.items()
+    }
+
+    # Evict any purged attributes from the attributes ids cache
+    for purged_attribute_id in purged_attributes_ids.intersection(
+        state_attributes_ids_reversed
+    ):
+        state_attributes_ids.pop(
+            state_attributes_ids_reversed[purged_attribute_id], None
+        )
+
 
 def _purge_statistics_runs(session: Session, statistics_runs: list[int]) -> None:
     """Delete by run_id."""
@@ -226,38 +311,50 @@ def _purge_filtered_data(instance: Recorder, session: Session) -> bool:
     _LOGGER.debug("Cleanup filtered data")
 
     # Check if excluded entity_ids are in database
-    excluded_entity_ids: list[str] = [
-        entity_id
-        for (entity_id,) in session.query(distinct(States.entity_id)).all()
+    excluded_metadata_ids: list[int] = [
+        metadata_id
+        for (metadata_id, entity_id) in _select_recorded_states_meta(session)
         if not instance.entity_filter(entity_id)
     ]
-    if len(excluded_entity_ids) > 0:
-        _purge_filtered_states(instance, session, excluded_entity_ids)
+    if len(excluded_metadata_ids) > 0:
+        _purge_filtered_states(instance, session, excluded_metadata_ids)
         return False
 
     # Check if excluded event_types are in database
-    excluded_event_types: list[str] = [
-        event_type
-        for (event_type,) in session.query(distinct(Events.event_type)).all()
-        if event_type in instance.exclude_t
+    excluded_event_type_ids: list[int] = [
+        event_type_id
+        for (event_type_id,) in session.query(EventTypes.event_type_id)
+        .filter(EventTypes.event_type.in_(instance.exclude_t))
+        .filter(exists().where(Events.event_type_id == EventTypes.event_type_id))
+        .all()
     ]
-    if len(excluded_event_types) > 0:
-        _purge_filtered_events(instance, session, excluded_event_types)
+    if len(excluded_event_type_ids) > 0:
+        _purge_filtered_events(instance, session, excluded_event_type_ids)
         return False
 
     return True
 
 
+def _select_recorded_states_meta(session: Session) -> list[tuple[int, str]]:
+    """Return the metadata_id and entity_id of entities with states in the database."""
+    return (
+        session.query(StatesMeta.metadata_id, StatesMeta.entity_id)
+        .filter(exists().where(States.metadata_id == StatesMeta.metadata_id))
+        .all()
+    )
+
+
 def _purge_filtered_states(
-    instance: Recorder, session: Session, excluded_entity_ids: list[str]
+    instance: Recorder, session: Session, excluded_metadata_ids: list[int]
 ) -> None:
     """Remove filtered states and linked events."""
     state_ids: list[int]
     event_ids: list[int | None]
-    state_ids, event_ids = zip(
+    attributes_ids: list[int | None]
+    state_ids, event_ids, attributes_ids = zip(
         *(
-            session.query(States.state_id, States.event_id)
-            .filter(States.entity_id.in_(excluded_entity_ids))
+            session.query(States.state_id, States.event_id, States.attributes_id)
+            .filter(States.metadata_id.in_(excluded_metadata_ids))
             .limit(MAX_ROWS_TO_PURGE)
             .all()
         )
@@ -268,15 +365,19 @@ def _purge_filtered_states(
     )
     _purge_state_ids(instance, session, set(state_ids))
     _purge_event_ids(session, event_ids)  # type: ignore  # type of event_ids already narrowed to 'list[int]'
+    if unused_attributes_ids := _select_unused_attributes_ids(
+        session, {id_ for id_ in attributes_ids if id_ is not None}
+    ):
+        _purge_attributes_ids(instance, session, unused_attributes_ids)
 
 
 def _purge_filtered_events(
-    instance: Recorder, session: Session, excluded_event_types: list[str]
+    instance: Recorder, session: Session, excluded_event_type_ids: list[int]
 ) -> None:
     """Remove filtered events and linked states."""
     events: list[Events] = (
         session.query(Events.event_id)
-        .filter(Events.event_type.in_(excluded_event_types))
+        .filter(Events.event_type_id.in_(excluded_event_type_ids))
         .limit(MAX_ROWS_TO_PURGE)
         .all()
     )
@@ -285,26 +386,40 @@ def _purge_filtered_events(
         "Selected %s event_ids to remove that should be filtered", len(event_ids)
     )
     states: list[States] = (
-        session.query(States.state_id).filter(States.event_id.in_(event_ids)).all()
+        session.query(States.state_id, States.attributes_id)
+        .filter(States.event_id.in_(event_ids))
+        .all()
     )
     state_ids: set[int] = {state.state_id for state in states}
+    attributes_ids: set[int] = {
+        state.attributes_id for state in states if state.attributes_id
+    }
     _purge_state_ids(instance, session, state_ids)
     _purge_event_ids(session, event_ids)
+    if unused_attributes_ids := _select_unused_attributes_ids(session, attributes_ids):
+        _purge_attributes_ids(instance, session, unused_attributes_ids)
 
 
 @retryable_database_job("purge")
 def purge_entity_data(instance: Recorder, entity_filter: Callable[[str], bool]) -> bool:
     """Purge states and events of specified entities."""
     with session_scope(session=instance.get_session()) as session:  # type: ignore
-        selected_entity_ids: list[str] = [
-            entity_id
-            for (entity_id,) in session.query(distinct(States.entity_id)).all()
+        selected_states_meta = [
+            (metadata_id, entity_id)
+            for (metadata_id, entity_id) in _select_recorded_states_meta(session)
             if entity_filter(entity_id)
         ]
-        _LOGGER.debug("Purging entity data for %s", selected_entity_ids)
-        if len(selected_entity_ids) > 0:
+        _LOGGER.debug(
+            "Purging entity data for %s",
+            [entity_id for _, entity_id in selected_states_meta],
+        )
+        if len(selected_states_meta) > 0:
             # Purge a max of MAX_ROWS_TO_PURGE, based on the oldest states or events record
-            _purge_filtered_states(instance, session, selected_entity_ids)
+            _purge_filtered_states(
+                instance,
+                session,
+                [metadata_id for metadata_id, _ in selected_states_meta],
+            )
             _LOGGER.debug("Purging entity data hasn't fully completed yet")
             return False
 
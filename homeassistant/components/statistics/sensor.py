@@ -12,7 +12,12 @@ from typing import Any, Literal, cast
 import voluptuous as vol
 
 from homeassistant.components.binary_sensor import DOMAIN as BINARY_SENSOR_DOMAIN
-from homeassistant.components.recorder.models import States
+from homeassistant.components.recorder.models import (
+    LazyState,
+    StateAttributes,
+    States,
+    StatesMeta,
+)
 from homeassistant.components.recorder.util import execute, session_scope
 from homeassistant.components.sensor import (
     PLATFORM_SCHEMA,
@@ -484,8 +489,21 @@ class StatisticsSensor(SensorEntity):
         _LOGGER.debug("%s: initializing values from the database", self.entity_id)
 
         with session_scope(hass=self.hass) as session:
-            query = session.query(States).filter(
-                States.entity_id == self._source_entity_id.lower()
+            query = (
+                session.query(
+                    States.entity_id,
+                    States.state,
+                    States.attributes,
+                    StateAttributes.shared_attrs,
+                    States.last_changed_ts,
+                    States.last_updated_ts,
+                )
+                .outerjoin(
+                    StateAttributes,
+                    States.attributes_id == StateAttributes.attributes_id,
+                )
+                .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+                .filter(StatesMeta.entity_id == self._source_entity_id.lower())
             )
 
             if self._samples_max_age is not None:
@@ -502,7 +520,7 @@ class StatisticsSensor(SensorEntity):
             query = query.order_by(States.last_updated.desc()).limit(
                 self._samples_max_buffer_size
             )
-            states = execute(query, to_native=True, validate_entity_ids=False)
+            states = [LazyState(row) for row in execute(query)]
 
         if states:
             for state in reversed(states):
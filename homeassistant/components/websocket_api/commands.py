@@ -15,7 +15,7 @@ from homeassistant.const import (
     MATCH_ALL,
     SIGNAL_BOOTSTRAP_INTEGRATONS,
 )
-from homeassistant.core import Context, Event, HomeAssistant, callback
+from homeassistant.core import Context, Event, HomeAssistant, State, callback
 from homeassistant.exceptions import (
     HomeAssistantError,
     ServiceNotFound,
@@ -33,6 +33,10 @@ from homeassistant.helpers.json import ExtendedJSONEncoder
 from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.loader import IntegrationNotFound, async_get_integration
 from homeassistant.setup import DATA_SETUP_TIME, async_get_loaded_integrations
+from homeassistant.util.json import (
+    find_paths_unserializable_data,
+    format_unserializable_data,
+)
 
 from . import const, decorators, messages
 from .connection import ActiveConnection
@@ -58,6 +62,7 @@ def async_register_commands(
     async_reg(hass, handle_ping)
     async_reg(hass, handle_render_template)
     async_reg(hass, handle_subscribe_bootstrap_integrations)
+    async_reg(hass, handle_subscribe_entities)
     async_reg(hass, handle_subscribe_events)
     async_reg(hass, handle_subscribe_trigger)
     async_reg(hass, handle_test_condition)
@@ -233,17 +238,94 @@ def handle_get_states(
     hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
 ) -> None:
     """Handle get states command."""
+    states = _async_get_allowed_states(hass, connection)
+
+    # Splice the cached JSON of each state into the response so
+    # states are only serialized once for all the connections
+    try:
+        serialized_states = [state.as_dict_json() for state in states]
+    except (ValueError, TypeError):
+        connection.send_message(messages.result_message(msg["id"], states))
+        return
+
+    connection.send_message(
+        messages.construct_result_message(msg["id"], f"[{','.join(serialized_states)}]")
+    )
+
+
+@callback
+def _async_get_allowed_states(
+    hass: HomeAssistant, connection: ActiveConnection
+) -> list[State]:
+    """Return the states the user of the connection is allowed to read."""
     if connection.user.permissions.access_all_entities("read"):
-        states = hass.states.async_all()
-    else:
-        entity_perm = connection.user.permissions.check_entity
-        states = [
-            state
-            for state in hass.states.async_all()
-            if entity_perm(state.entity_id, "read")
-        ]
-
-    connection.send_message(messages.result_message(msg["id"], states))
+        return hass.states.async_all()
+    entity_perm = connection.user.permissions.check_entity
+    return [
+        state
+        for state in hass.states.async_all()
+        if entity_perm(state.entity_id, "read")
+    ]
+
+
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "subscribe_entities",
+        vol.Optional("entity_ids"): cv.entity_ids,
+    }
+)
+def handle_subscribe_entities(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle subscribe entities command.
+
+    Sends the compressed states of the entities followed by
+    a diff of each state change.
+    """
+    entity_ids = set(msg.get("entity_ids", []))
+
+    @callback
+    def forward_entity_changes(event: Event) -> None:
+        """Forward the diff of entity state changes to websocket."""
+        entity_id = event.data["entity_id"]
+        if entity_ids and entity_id not in entity_ids:
+            return
+        if not connection.user.permissions.check_entity(entity_id, POLICY_READ):
+            return
+
+        connection.send_message(messages.cached_state_diff_message(msg["id"], event))
+
+    # We must never await between reading the states and listening
+    # for state changes or some of the changes would be missed
+    states = [
+        state
+        for state in _async_get_allowed_states(hass, connection)
+        if not entity_ids or state.entity_id in entity_ids
+    ]
+    connection.subscriptions[msg["id"]] = hass.bus.async_listen(
+        EVENT_STATE_CHANGED, forward_entity_changes
+    )
+    connection.send_result(msg["id"])
+
+    serialized_states = []
+    for state in states:
+        try:
+            serialized_states.append(state.as_compressed_state_json())
+        except (ValueError, TypeError):
+            connection.logger.error(
+                "Unable to serialize to JSON. Bad data found at %s",
+                format_unserializable_data(
+                    find_paths_unserializable_data(state, dump=const.JSON_DUMP)
+                ),
+            )
+
+    connection.send_message(
+        messages.construct_event_message(
+            msg["id"],
+            f'{{"{messages.ENTITY_EVENT_ADD}":{{{",".join(serialized_states)}}}}}',
+        )
+    )
 
 
 @decorators.websocket_command({vol.Required("type"): "get_services"})
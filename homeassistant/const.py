@@ -64,6 +64,13 @@ ENTITY_MATCH_ALL: Final = "all"
 # If no name is specified
 DEVICE_DEFAULT_NAME: Final = "Unnamed Device"
 
+# Keys of the compressed state representation
+COMPRESSED_STATE_STATE: Final = "s"
+COMPRESSED_STATE_ATTRIBUTES: Final = "a"
+COMPRESSED_STATE_CONTEXT: Final = "c"
+COMPRESSED_STATE_LAST_CHANGED: Final = "lc"
+COMPRESSED_STATE_LAST_UPDATED: Final = "lu"
+
 # Max characters for data stored in the recorder (changes to these limits would require
 # a database migration)
 MAX_LENGTH_EVENT_EVENT_TYPE: Final = 64
@@ -49,6 +49,11 @@ from .const import (
     ATTR_SECONDS,
     ATTR_SERVICE,
     ATTR_SERVICE_DATA,
+    COMPRESSED_STATE_ATTRIBUTES,
+    COMPRESSED_STATE_CONTEXT,
+    COMPRESSED_STATE_LAST_CHANGED,
+    COMPRESSED_STATE_LAST_UPDATED,
+    COMPRESSED_STATE_STATE,
     CONF_UNIT_SYSTEM_IMPERIAL,
     EVENT_CALL_SERVICE,
     EVENT_CORE_CONFIG_UPDATE,
@@ -260,6 +265,7 @@ class HomeAssistant:
         self._stopped: asyncio.Event | None = None
         # Timeout handler for Core/Helper namespace
         self.timeout: TimeoutManager = TimeoutManager()
+        self._tick_listeners: list[Callable[[datetime.datetime], None]] = []
 
     @property
     def is_running(self) -> bool:
@@ -567,6 +573,45 @@ class HomeAssistant:
         target = cast(Callable[..., _R], target)
         return self.async_run_hass_job(HassJob(target), *args)
 
+    @callback
+    def async_listen_tick(
+        self, target: Callable[[datetime.datetime], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for the timer tick that happens every second.
+
+        The target must be a callback and is called with the time of the
+        tick without going through the event bus, so it is cheaper than
+        listening for EVENT_TIME_CHANGED.
+
+        This method must be run in the event loop.
+        """
+        if not is_callback(target):
+            raise HomeAssistantError(f"Tick listener {target} is not a callback")
+        # The list is replaced instead of mutated so async_fire_tick
+        # can iterate it while listeners are added or removed
+        self._tick_listeners = [*self._tick_listeners, target]
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the tick listener."""
+            listeners = self._tick_listeners.copy()
+            listeners.remove(target)
+            self._tick_listeners = listeners
+
+        return remove_listener
+
+    @callback
+    def async_fire_tick(self, now: datetime.datetime) -> None:
+        """Call the tick listeners.
+
+        This method must be run in the event loop.
+        """
+        for target in self._tick_listeners:
+            try:
+                target(now)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error in tick listener %s", target)
+
     def block_till_done(self) -> None:
         """Block until all pending work is done."""
         asyncio.run_coroutine_threadsafe(
@@ -778,6 +823,7 @@ class _FilterableJob(NamedTuple):
 
     job: HassJob[None | Awaitable[None]]
     event_filter: Callable[[Event], bool] | None
+    run_immediately: bool = False
 
 
 class EventBus:
@@ -796,6 +842,16 @@ class EventBus:
         """
         return {key: len(listeners) for key, listeners in self._listeners.items()}
 
+    @callback
+    def async_has_listeners(self, event_type: str) -> bool:
+        """Return if there are listeners for a specific event type.
+
+        Listeners for all events are not counted.
+
+        This method must be run in the event loop.
+        """
+        return event_type in self._listeners
+
     @property
     def listeners(self) -> dict[str, int]:
         """Return dictionary with events and the number of listeners."""
@@ -846,7 +902,7 @@ class EventBus:
         if not listeners:
             return
 
-        for job, event_filter in listeners:
+        for job, event_filter, run_immediately in listeners:
             if event_filter is not None:
                 try:
                     if not event_filter(event):
@@ -854,7 +910,13 @@ class EventBus:
                 except Exception:  # pylint: disable=broad-except
                     _LOGGER.exception("Error in event filter")
                     continue
-            self._hass.async_add_hass_job(job, event)
+            if run_immediately:
+                try:
+                    job.target(event)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Error running job: %s", job)
+            else:
+                self._hass.async_add_hass_job(job, event)
 
     def listen(
         self,
@@ -882,6 +944,7 @@ class EventBus:
         event_type: str,
         listener: Callable[[Event], None | Awaitable[None]],
         event_filter: Callable[[Event], bool] | None = None,
+        run_immediately: bool = False,
     ) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
 
@@ -892,19 +955,32 @@ class EventBus:
         @callback that returns a boolean value, determines if the
         listener callable should run.
 
+        If run_immediately is passed, the listener, which must be a
+        callable decorated with @callback, is called while the event is
+        fired instead of being scheduled with call_soon. Only use it for
+        listeners that do little work or hand the event to other jobs.
+
         This method must be run in the event loop.
         """
         if event_filter is not None and not is_callback(event_filter):
             raise HomeAssistantError(f"Event filter {event_filter} is not a callback")
+        if run_immediately and not is_callback(listener):
+            raise HomeAssistantError(f"Event listener {listener} is not a callback")
         return self._async_listen_filterable_job(
-            event_type, _FilterableJob(HassJob(listener), event_filter)
+            event_type,
+            _FilterableJob(HassJob(listener), event_filter, run_immediately),
         )
 
     @callback
     def _async_listen_filterable_job(
         self, event_type: str, filterable_job: _FilterableJob
     ) -> CALLBACK_TYPE:
-        self._listeners.setdefault(event_type, []).append(filterable_job)
+        # The listener lists are replaced instead of mutated so
+        # async_fire can iterate them while listeners run immediately
+        self._listeners[event_type] = [
+            *self._listeners.get(event_type, ()),
+            filterable_job,
+        ]
 
         def remove_listener() -> None:
             """Remove the listener."""
@@ -980,10 +1056,13 @@ class EventBus:
         This method must be run in the event loop.
         """
         try:
-            self._listeners[event_type].remove(filterable_job)
+            listeners = self._listeners[event_type].copy()
+            listeners.remove(filterable_job)
 
             # delete event_type list if empty
-            if not self._listeners[event_type]:
+            if listeners:
+                self._listeners[event_type] = listeners
+            else:
                 self._listeners.pop(event_type)
         except (KeyError, ValueError):
             # KeyError is key event_type listener did not exist
@@ -1019,6 +1098,9 @@ class State:
         "domain",
         "object_id",
         "_as_dict",
+        "_as_dict_json",
+        "_as_compressed_state",
+        "_as_compressed_state_json",
     ]
 
     def __init__(
@@ -1054,6 +1136,9 @@ class State:
         self.context = context or Context()
         self.domain, self.object_id = split_entity_id(self.entity_id)
         self._as_dict: ReadOnlyDict[str, Collection[Any]] | None = None
+        self._as_dict_json: str | None = None
+        self._as_compressed_state: ReadOnlyDict[str, Any] | None = None
+        self._as_compressed_state_json: str | None = None
 
     @property
     def name(self) -> str:
@@ -1088,6 +1173,70 @@ class State:
             )
         return self._as_dict
 
+    def as_dict_json(self) -> str:
+        """Return the JSON serialized dict representation of the State.
+
+        Async friendly.
+
+        The JSON is cached so a state sent to many clients is only
+        serialized once. Raises TypeError or ValueError if the
+        attributes are not JSON serializable.
+        """
+        if self._as_dict_json is None:
+            # pylint: disable=import-outside-toplevel
+            from .helpers.json import json_dumps
+
+            self._as_dict_json = json_dumps(self.as_dict())
+        return self._as_dict_json
+
+    def as_compressed_state(self) -> ReadOnlyDict[str, Any]:
+        """Return a compressed dict representation of the State.
+
+        Async friendly.
+
+        Timestamps are sent as seconds since the epoch, last_updated
+        is left out if it matches last_changed and the context is sent
+        as its id if it has no parent or user.
+        """
+        if self._as_compressed_state is None:
+            context = self.context
+            compressed_context: str | dict[str, str | None]
+            if context.parent_id is None and context.user_id is None:
+                compressed_context = context.id
+            else:
+                compressed_context = context.as_dict()
+            compressed_state: dict[str, Any] = {
+                COMPRESSED_STATE_STATE: self.state,
+                COMPRESSED_STATE_ATTRIBUTES: self.attributes,
+                COMPRESSED_STATE_CONTEXT: compressed_context,
+                COMPRESSED_STATE_LAST_CHANGED: self.last_changed.timestamp(),
+            }
+            if self.last_changed != self.last_updated:
+                compressed_state[
+                    COMPRESSED_STATE_LAST_UPDATED
+                ] = self.last_updated.timestamp()
+            self._as_compressed_state = ReadOnlyDict(compressed_state)
+        return self._as_compressed_state
+
+    def as_compressed_state_json(self) -> str:
+        """Return the compressed State as a JSON key value pair.
+
+        Async friendly.
+
+        The pair maps the entity_id to the compressed state so the
+        pairs of many states can be joined into a single JSON object.
+        Raises TypeError or ValueError if the attributes are not JSON
+        serializable.
+        """
+        if self._as_compressed_state_json is None:
+            # pylint: disable=import-outside-toplevel
+            from .helpers.json import json_dumps
+
+            self._as_compressed_state_json = json_dumps(
+                {self.entity_id: self.as_compressed_state()}
+            )[1:-1]
+        return self._as_compressed_state_json
+
     @classmethod
     def from_dict(cls: type[_StateT], json_dict: dict[str, Any]) -> _StateT | None:
         """Initialize a state from a dict.
@@ -1147,6 +1296,8 @@ class StateMachine:
     def __init__(self, bus: EventBus, loop: asyncio.events.AbstractEventLoop) -> None:
         """Initialize state machine."""
         self._states: dict[str, State] = {}
+        # States indexed by domain so domain queries don't scan every state
+        self._domain_index: dict[str, dict[str, State]] = {}
         self._reservations: set[str] = set()
         self._bus = bus
         self._loop = loop
@@ -1169,13 +1320,10 @@ class StateMachine:
         if domain_filter is None:
             return list(self._states)
 
-        if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
-
         return [
-            state.entity_id
-            for state in self._states.values()
-            if state.domain in domain_filter
+            entity_id
+            for domain_states in self._async_domain_states(domain_filter)
+            for entity_id in domain_states
         ]
 
     @callback
@@ -1189,11 +1337,9 @@ class StateMachine:
         if domain_filter is None:
             return len(self._states)
 
-        if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
-
-        return len(
-            [None for state in self._states.values() if state.domain in domain_filter]
+        return sum(
+            len(domain_states)
+            for domain_states in self._async_domain_states(domain_filter)
         )
 
     def all(self, domain_filter: str | Iterable[str] | None = None) -> list[State]:
@@ -1213,11 +1359,24 @@ class StateMachine:
         if domain_filter is None:
             return list(self._states.values())
 
+        return [
+            state
+            for domain_states in self._async_domain_states(domain_filter)
+            for state in domain_states.values()
+        ]
+
+    @callback
+    def _async_domain_states(
+        self, domain_filter: str | Iterable[str]
+    ) -> list[dict[str, State]]:
+        """Return the indexed states of each domain in the filter."""
         if isinstance(domain_filter, str):
             domain_filter = (domain_filter.lower(),)
 
         return [
-            state for state in self._states.values() if state.domain in domain_filter
+            self._domain_index[domain]
+            for domain in dict.fromkeys(domain_filter)
+            if domain in self._domain_index
         ]
 
     def get(self, entity_id: str) -> State | None:
@@ -1261,6 +1420,11 @@ class StateMachine:
         if old_state is None:
             return False
 
+        domain_states = self._domain_index[old_state.domain]
+        del domain_states[entity_id]
+        if not domain_states:
+            del self._domain_index[old_state.domain]
+
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": None},
@@ -1365,6 +1529,7 @@ class StateMachine:
             old_state is None,
         )
         self._states[entity_id] = state
+        self._domain_index.setdefault(state.domain, {})[entity_id] = state
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": state},
@@ -1928,9 +2093,16 @@ def _async_create_timer(hass: HomeAssistant) -> None:
         """Fire next time event."""
         now = dt_util.utcnow()
 
-        hass.bus.async_fire(
-            EVENT_TIME_CHANGED, {ATTR_NOW: now}, time_fired=now, context=timer_context
-        )
+        hass.async_fire_tick(now)
+        # Only listeners for EVENT_TIME_CHANGED itself get the event,
+        # the listeners for all events don't need one every second
+        if hass.bus.async_has_listeners(EVENT_TIME_CHANGED):
+            hass.bus.async_fire(
+                EVENT_TIME_CHANGED,
+                {ATTR_NOW: now},
+                time_fired=now,
+                context=timer_context,
+            )
 
         # If we are more than a second late, a tick was missed
         if (late := monotonic() - target) > 1:
@@ -43,7 +43,8 @@ from . import (
 )
 from .device_registry import DeviceRegistry
 from .entity_registry import EntityRegistry, RegistryEntryDisabler
-from .event import async_call_later, async_track_time_interval
+from .event import async_call_later
+from .polling import async_track_poll_interval
 from .typing import ConfigType, DiscoveryInfoType
 
 if TYPE_CHECKING:
@@ -402,10 +403,11 @@ class EntityPlatform:
         ):
             return
 
-        self._async_unsub_polling = async_track_time_interval(
+        self._async_unsub_polling = async_track_poll_interval(
             self.hass,
             self._update_entity_states,
             self.scan_interval,
+            f"{self.domain}.{self.platform_name}",
         )
 
     async def _async_add_entity(  # noqa: C901
@@ -7,7 +7,9 @@ import copy
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import functools as ft
+import heapq
 import logging
+import math
 import time
 from typing import Any, Union, cast
 
@@ -56,6 +58,10 @@ TRACK_STATE_REMOVED_DOMAIN_LISTENER = "track_state_removed_domain_listener"
 TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS = "track_entity_registry_updated_callbacks"
 TRACK_ENTITY_REGISTRY_UPDATED_LISTENER = "track_entity_registry_updated_listener"
 
+TIMER_WHEEL = "timer_wheel"
+# Width in seconds of the slots the timer wheel groups timers in
+TIMER_WHEEL_TICK = 1.0
+
 _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
 _ENTITIES_LISTENER = "entities"
@@ -280,6 +286,7 @@ def async_track_state_change_event(
             EVENT_STATE_CHANGED,
             _async_state_change_dispatcher,
             event_filter=_async_state_change_filter,
+            run_immediately=True,
         )
 
     job = HassJob(action)
@@ -371,6 +378,7 @@ def async_track_entity_registry_updated_event(
             EVENT_ENTITY_REGISTRY_UPDATED,
             _async_entity_registry_updated_dispatcher,
             event_filter=_async_entity_registry_updated_filter,
+            run_immediately=True,
         )
 
     job = HassJob(action)
@@ -443,6 +451,7 @@ def async_track_state_added_domain(
             EVENT_STATE_CHANGED,
             _async_state_change_dispatcher,
             event_filter=_async_state_change_filter,
+            run_immediately=True,
         )
 
     job = HassJob(action)
@@ -495,6 +504,7 @@ def async_track_state_removed_domain(
             EVENT_STATE_CHANGED,
             _async_state_change_dispatcher,
             event_filter=_async_state_change_filter,
+            run_immediately=True,
         )
 
     job = HassJob(action)
@@ -1251,6 +1261,137 @@ def async_track_point_in_time(
 track_point_in_time = threaded_listener_factory(async_track_point_in_time)
 
 
+class _TimerEntry:
+    """A job scheduled on the timer wheel."""
+
+    __slots__ = ("when", "point_in_time", "job", "cancelled")
+
+    def __init__(
+        self,
+        point_in_time: datetime,
+        job: HassJob[Awaitable[None] | None],
+    ) -> None:
+        """Initialize the timer entry."""
+        self.when = point_in_time.timestamp()
+        self.point_in_time = point_in_time
+        self.job = job
+        self.cancelled = False
+
+
+class _TimerWheel:
+    """Run the point in time trackers from a single loop timer.
+
+    Timers are grouped in slots of TIMER_WHEEL_TICK seconds and only the
+    occupied slots are kept in a heap. One TimerHandle is armed for the
+    earliest timer, and when it fires every timer that is due runs in the
+    same loop iteration. Cancelling a timer removes it from its slot in
+    constant time.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the timer wheel."""
+        self._hass = hass
+        self._slots: dict[int, set[_TimerEntry]] = {}
+        self._slot_heap: list[int] = []
+        self._handle: asyncio.TimerHandle | None = None
+        self._armed_when: float | None = None
+
+    @callback
+    def async_add(
+        self, point_in_time: datetime, job: HassJob[Awaitable[None] | None]
+    ) -> _TimerEntry:
+        """Schedule a job to run at a point in UTC time."""
+        entry = _TimerEntry(point_in_time, job)
+        slot = int(entry.when // TIMER_WHEEL_TICK)
+        if (entries := self._slots.get(slot)) is None:
+            entries = self._slots[slot] = set()
+            heapq.heappush(self._slot_heap, slot)
+        entries.add(entry)
+        if self._armed_when is None or entry.when < self._armed_when:
+            self._async_arm(entry.when)
+        return entry
+
+    @callback
+    def async_remove(self, entry: _TimerEntry) -> None:
+        """Cancel a scheduled job.
+
+        Emptied slots are dropped once they reach the top of the heap.
+        """
+        entry.cancelled = True
+        if entries := self._slots.get(int(entry.when // TIMER_WHEEL_TICK)):
+            entries.discard(entry)
+
+    @callback
+    def _async_arm(self, when: float, now: float | None = None) -> None:
+        """Arm the loop timer for a point in time."""
+        if self._handle is not None:
+            self._handle.cancel()
+        self._armed_when = when
+        self._handle = self._hass.loop.call_later(
+            when - (time.time() if now is None else now), self._async_run_due
+        )
+
+    @callback
+    def _async_arm_next(self, now: float | None = None) -> None:
+        """Arm the loop timer for the earliest scheduled job."""
+        slot_heap = self._slot_heap
+        while slot_heap and not self._slots[slot_heap[0]]:
+            del self._slots[heapq.heappop(slot_heap)]
+        if slot_heap:
+            self._async_arm(min(entry.when for entry in self._slots[slot_heap[0]]), now)
+        else:
+            self._armed_when = None
+
+    @callback
+    def _async_run_due(self) -> None:
+        """Run the jobs that are due."""
+        self._handle = None
+        # Timers added by the jobs are armed once they have all run
+        self._armed_when = -math.inf
+
+        # Depending on the available clock support (including timer hardware
+        # and the OS kernel) it can happen that we fire a little bit too early
+        # as measured by utcnow(). That is bad when callbacks have assumptions
+        # about the current time. Thus, jobs that are not due yet stay on the
+        # wheel and the timer is rearmed for them.
+        now = time_tracker_utcnow().timestamp()
+        slot_heap = self._slot_heap
+        due: list[_TimerEntry] = []
+        while slot_heap and slot_heap[0] * TIMER_WHEEL_TICK <= now:
+            entries = self._slots[slot_heap[0]]
+            if ready := [entry for entry in entries if entry.when <= now]:
+                entries.difference_update(ready)
+                due.extend(ready)
+            if entries:
+                break
+            del self._slots[heapq.heappop(slot_heap)]
+
+        if not due:
+            # Rearm for the remaining time as measured by utcnow()
+            self._async_arm_next(now)
+            return
+
+        due.sort(key=lambda entry: entry.when)
+        for entry in due:
+            # A job that ran before may have cancelled this one
+            if entry.cancelled:
+                continue
+            try:
+                self._hass.async_run_hass_job(entry.job, entry.point_in_time)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error running job: %s", entry.job)
+
+        self._async_arm_next()
+
+
+@callback
+def _async_get_timer_wheel(hass: HomeAssistant) -> _TimerWheel:
+    """Return the timer wheel of the event helpers."""
+    if (timer_wheel := hass.data.get(TIMER_WHEEL)) is None:
+        timer_wheel = hass.data[TIMER_WHEEL] = _TimerWheel(hass)
+    return cast(_TimerWheel, timer_wheel)
+
+
 @callback
 @bind_hass
 def async_track_point_in_utc_time(
@@ -1265,37 +1406,14 @@ def async_track_point_in_utc_time(
 
     # Since this is called once, we accept a HassJob so we can avoid
     # having to figure out how to call the action every time its called.
-    cancel_callback: asyncio.TimerHandle | None = None
-
-    @callback
-    def run_action(job: HassJob[Awaitable[None] | None]) -> None:
-        """Call the action."""
-        nonlocal cancel_callback
-
-        now = time_tracker_utcnow()
-
-        # Depending on the available clock support (including timer hardware
-        # and the OS kernel) it can happen that we fire a little bit too early
-        # as measured by utcnow(). That is bad when callbacks have assumptions
-        # about the current time. Thus, we rearm the timer for the remaining
-        # time.
-        if (delta := (utc_point_in_time - now).total_seconds()) > 0:
-            _LOGGER.debug("Called %f seconds too early, rearming", delta)
-
-            cancel_callback = hass.loop.call_later(delta, run_action, job)
-            return
-
-        hass.async_run_hass_job(job, utc_point_in_time)
-
     job = action if isinstance(action, HassJob) else HassJob(action)
-    delta = utc_point_in_time.timestamp() - time.time()
-    cancel_callback = hass.loop.call_later(delta, run_action, job)
+    timer_wheel = _async_get_timer_wheel(hass)
+    entry = timer_wheel.async_add(utc_point_in_time, job)
 
     @callback
     def unsub_point_in_time_listener() -> None:
-        """Cancel the call_later."""
-        assert cancel_callback is not None
-        cancel_callback.cancel()
+        """Cancel the timer."""
+        timer_wheel.async_remove(entry)
 
     return unsub_point_in_time_listener
 
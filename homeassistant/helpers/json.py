@@ -3,6 +3,8 @@ import datetime
 import json
 from typing import Any
 
+from homeassistant.util.json import json_bytes as _json_bytes
+
 
 class JSONEncoder(json.JSONEncoder):
     """JSONEncoder that supports Home Assistant objects."""
@@ -40,3 +42,28 @@ class ExtendedJSONEncoder(JSONEncoder):
             return super().default(o)
         except TypeError:
             return {"__type": str(type(o)), "repr": repr(o)}
+
+
+def json_encoder_default(obj: Any) -> Any:
+    """Convert Home Assistant objects for the JSON backend.
+
+    This is the JSONEncoder.default equivalent for json_bytes, which
+    also handles ReadOnlyDict natively.
+    """
+    if isinstance(obj, set):
+        return list(obj)
+    if hasattr(obj, "as_dict"):
+        return obj.as_dict()
+    if isinstance(obj, datetime.datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_bytes(data: Any) -> bytes:
+    """Serialize data with Home Assistant objects to JSON bytes."""
+    return _json_bytes(data, json_encoder_default)
+
+
+def json_dumps(data: Any) -> str:
+    """Serialize data with Home Assistant objects to a JSON string."""
+    return _json_bytes(data, json_encoder_default).decode("UTF-8")
@@ -0,0 +1,246 @@
+"""Schedule the polls of entity platforms and data update coordinators."""
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from functools import partial
+import logging
+import math
+import time
+from typing import Any, cast
+import zlib
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.loader import bind_hass
+from homeassistant.util import dt as dt_util
+from homeassistant.util.executor import default_executor_saturated
+
+from .event import async_track_point_in_utc_time
+
+DATA_POLL_SCHEDULER = "poll_scheduler"
+
+# Polls are spread over the second they are due in. Polls that land
+# in the same window of the second are run with a single wakeup.
+POLL_WINDOWS_PER_SECOND = 10
+
+# While the executor is saturated due polls are held back, but never
+# for longer than the max delay
+POLL_BACKPRESSURE_DELAY = timedelta(seconds=0.5)
+POLL_MAX_BACKPRESSURE_DELAY = 5.0
+
+_LOGGER = logging.getLogger(__name__)
+
+PollActionType = Callable[[datetime], Awaitable[None]]
+
+
+@dataclass
+class PollStats:
+    """Statistics of the polls with the same name."""
+
+    polls: int = 0
+    deferred: int = 0
+    last_duration: float = 0.0
+    max_duration: float = 0.0
+    total_duration: float = 0.0
+    last_lag: float = 0.0
+    max_lag: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dictionary representation of the statistics."""
+        return asdict(self)
+
+
+class _Poll:
+    """A poll waiting on the poll scheduler."""
+
+    __slots__ = ("name", "action", "point_in_time", "batch")
+
+    def __init__(
+        self, name: str, action: PollActionType, point_in_time: datetime
+    ) -> None:
+        """Initialize the poll."""
+        self.name = name
+        self.action = action
+        self.point_in_time = point_in_time
+        self.batch: float | None = None
+
+
+class PollScheduler:
+    """Run polls in batches that are spread over the second.
+
+    Each poll name gets a fixed window of the second, so polls that
+    are due in the same second no longer all start at once. Polls that
+    are due at the same point share one timer, and they are held back
+    while the executor has a backlog.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the poll scheduler."""
+        self._hass = hass
+        self._batches: dict[float, list[_Poll]] = {}
+        self._unsub_batches: dict[float, CALLBACK_TYPE] = {}
+        self.stats: dict[str, PollStats] = {}
+
+    @staticmethod
+    def jitter(name: str) -> float:
+        """Return the offset in the second that polls of a name run at."""
+        window = zlib.crc32(name.encode()) % POLL_WINDOWS_PER_SECOND
+        return window / POLL_WINDOWS_PER_SECOND
+
+    @callback
+    def async_next_poll(
+        self, name: str, interval: timedelta, now: datetime | None = None
+    ) -> datetime:
+        """Return the point in time a poll is due after an interval.
+
+        The point is never later than now plus the interval, like
+        flooring now to the second, but it is on the jittered second.
+        """
+        if now is None:
+            now = dt_util.utcnow()
+        offset = self.jitter(name)
+        point = math.floor(now.timestamp() - offset) + offset
+        return dt_util.utc_from_timestamp(round(point + interval.total_seconds(), 3))
+
+    @callback
+    def async_schedule(
+        self, name: str, point_in_time: datetime, action: PollActionType
+    ) -> CALLBACK_TYPE:
+        """Run a poll once at a point in time."""
+        poll = _Poll(name, action, point_in_time)
+        self._async_add(poll, point_in_time)
+
+        @callback
+        def cancel_poll() -> None:
+            """Cancel the poll."""
+            if poll.batch is not None:
+                self._async_discard(poll)
+
+        return cancel_poll
+
+    @callback
+    def _async_add(self, poll: _Poll, point_in_time: datetime) -> None:
+        """Add a poll to the batch of a point in time."""
+        batch = poll.batch = point_in_time.timestamp()
+        if (polls := self._batches.get(batch)) is None:
+            polls = self._batches[batch] = []
+            self._unsub_batches[batch] = async_track_point_in_utc_time(
+                self._hass, partial(self._async_run_batch, batch), point_in_time
+            )
+        polls.append(poll)
+
+    @callback
+    def _async_discard(self, poll: _Poll) -> None:
+        """Remove a poll from its batch."""
+        batch = cast(float, poll.batch)
+        poll.batch = None
+        polls = self._batches[batch]
+        polls.remove(poll)
+        if not polls:
+            del self._batches[batch]
+            self._unsub_batches.pop(batch)()
+
+    @callback
+    def _async_run_batch(self, batch: float, now: datetime) -> None:
+        """Run the polls of a batch."""
+        del self._unsub_batches[batch]
+        polls = self._batches.pop(batch)
+        saturated = default_executor_saturated(self._hass.loop)
+
+        for poll in polls:
+            poll.batch = None
+            if (
+                saturated
+                and (now - poll.point_in_time).total_seconds()
+                < POLL_MAX_BACKPRESSURE_DELAY
+            ):
+                self.stats.setdefault(poll.name, PollStats()).deferred += 1
+                self._async_add(poll, now + POLL_BACKPRESSURE_DELAY)
+                continue
+            self._hass.async_create_task(self._async_run_poll(poll, now))
+
+        if saturated:
+            _LOGGER.debug("Executor is saturated, holding back %d polls", len(polls))
+
+    async def _async_run_poll(self, poll: _Poll, now: datetime) -> None:
+        """Run a poll and record its statistics."""
+        stats = self.stats.setdefault(poll.name, PollStats())
+        lag = max((dt_util.utcnow() - poll.point_in_time).total_seconds(), 0.0)
+        start = time.monotonic()
+        try:
+            await poll.action(now)
+        finally:
+            duration = time.monotonic() - start
+            stats.polls += 1
+            stats.last_duration = duration
+            stats.max_duration = max(stats.max_duration, duration)
+            stats.total_duration += duration
+            stats.last_lag = lag
+            stats.max_lag = max(stats.max_lag, lag)
+            _LOGGER.debug(
+                "Polled %s in %.3f seconds, %.3f seconds late", poll.name, duration, lag
+            )
+
+
+@callback
+@bind_hass
+def async_get_poll_scheduler(hass: HomeAssistant) -> PollScheduler:
+    """Return the poll scheduler."""
+    if (scheduler := hass.data.get(DATA_POLL_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_POLL_SCHEDULER] = PollScheduler(hass)
+    return cast(PollScheduler, scheduler)
+
+
+@callback
+@bind_hass
+def async_schedule_poll(
+    hass: HomeAssistant, action: PollActionType, interval: timedelta, name: str
+) -> CALLBACK_TYPE:
+    """Run a poll once after an interval."""
+    scheduler = async_get_poll_scheduler(hass)
+    return scheduler.async_schedule(
+        name, scheduler.async_next_poll(name, interval), action
+    )
+
+
+@callback
+@bind_hass
+def async_track_poll_interval(
+    hass: HomeAssistant, action: PollActionType, interval: timedelta, name: str
+) -> CALLBACK_TYPE:
+    """Run a poll at every interval."""
+    scheduler = async_get_poll_scheduler(hass)
+    cancel_poll: CALLBACK_TYPE | None = None
+
+    async def interval_poll(now: datetime) -> None:
+        """Schedule the next poll and run this one."""
+        schedule_next_poll()
+        await action(now)
+
+    @callback
+    def schedule_next_poll() -> None:
+        """Schedule the next poll."""
+        nonlocal cancel_poll
+        cancel_poll = scheduler.async_schedule(
+            name, scheduler.async_next_poll(name, interval), interval_poll
+        )
+
+    schedule_next_poll()
+
+    @callback
+    def remove_listener() -> None:
+        """Stop polling."""
+        cast(CALLBACK_TYPE, cancel_poll)()
+
+    return remove_listener
+
+
+@callback
+@bind_hass
+def async_get_poll_stats(hass: HomeAssistant) -> dict[str, dict[str, Any]]:
+    """Return the poll statistics by name."""
+    return {
+        name: stats.as_dict()
+        for name, stats in async_get_poll_scheduler(hass).stats.items()
+    }
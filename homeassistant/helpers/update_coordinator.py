@@ -13,11 +13,10 @@ import aiohttp
 import requests
 
 from homeassistant import config_entries
-from homeassistant.core import CALLBACK_TYPE, Event, HassJob, HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
-from homeassistant.util.dt import utcnow
 
-from . import entity, event
+from . import entity, polling
 from .debounce import Debouncer
 
 REQUEST_REFRESH_DEFAULT_COOLDOWN = 10
@@ -59,7 +58,6 @@ class DataUpdateCoordinator(Generic[T]):
         self.data: T = None  # type: ignore[assignment]
 
         self._listeners: list[CALLBACK_TYPE] = []
-        self._job = HassJob(self._handle_refresh_interval)
         self._unsub_refresh: CALLBACK_TYPE | None = None
         self._request_refresh_task: asyncio.TimerHandle | None = None
         self.last_update_success = True
@@ -118,14 +116,15 @@ class DataUpdateCoordinator(Generic[T]):
             self._unsub_refresh()
             self._unsub_refresh = None
 
-        # We _floor_ utcnow to create a schedule on a rounded second,
-        # minimizing the time between the point and the real activation.
-        # That way we obtain a constant update frequency,
-        # as long as the update process takes less than a second
-        self._unsub_refresh = event.async_track_point_in_utc_time(
+        # The poll scheduler floors utcnow to a second that is jittered
+        # for this coordinator. That way we obtain a constant update
+        # frequency, as long as the update process takes less than a
+        # second, without all coordinators refreshing at once.
+        self._unsub_refresh = polling.async_schedule_poll(
             self.hass,
-            self._job,
-            utcnow().replace(microsecond=0) + self.update_interval,
+            self._handle_refresh_interval,
+            self.update_interval,
+            self.name,
         )
 
     async def _handle_refresh_interval(self, _now: datetime) -> None:
@@ -18,6 +18,7 @@ from homeassistant.const import ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGE
 from homeassistant.helpers.entityfilter import convert_include_exclude_filter
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.util import dt as dt_util
+from homeassistant.util.json import JSON_BACKEND
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
 # mypy: no-warn-return-any
@@ -87,6 +88,34 @@ async def fire_events(hass):
     return timer() - start
 
 
+@benchmark
+async def fire_events_run_immediately(hass):
+    """Fire a million events to a listener that runs immediately."""
+    count = 0
+    event_name = "benchmark_event"
+    events_to_fire = 10**6
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+    hass.bus.async_listen(event_name, listener, run_immediately=True)
+
+    # The listener runs while the events are fired
+    start = timer()
+
+    for _ in range(events_to_fire):
+        hass.bus.async_fire(event_name)
+
+    await hass.async_block_till_done()
+
+    assert count == events_to_fire
+
+    return timer() - start
+
+
 @benchmark
 async def fire_events_with_filter(hass):
     """Fire a million events with a filter that rejects them."""
@@ -206,11 +235,12 @@ async def state_changed_event_helper(hass):
         "new_state": core.State(entity_id, "on"),
     }
 
+    # The helper dispatches while the events are fired
+    start = timer()
+
     for _ in range(events_to_fire):
         hass.bus.async_fire(EVENT_STATE_CHANGED, event_data)
 
-    start = timer()
-
     await hass.async_block_till_done()
 
     assert count == events_to_fire
@@ -378,6 +408,20 @@ async def valid_entity_id(hass):
     return timer() - start
 
 
+@benchmark
+async def states_async_all_domain(hass):
+    """Query the states of a small domain 10k times with 5k entities."""
+    for idx in range(5000):
+        hass.states.async_set(f"sensor.sensor_{idx}", "on")
+    for idx in range(10):
+        hass.states.async_set(f"light.light_{idx}", "on")
+
+    start = timer()
+    for _ in range(10**4):
+        hass.states.async_all("light")
+    return timer() - start
+
+
 @benchmark
 async def json_serialize_states(hass):
     """Serialize million states with websocket default encoder."""
@@ -388,9 +432,135 @@ async def json_serialize_states(hass):
 
     start = timer()
     JSON_DUMP(states)
+    elapsed = timer() - start
+    print(f"Serialized with {JSON_BACKEND}")
+    return elapsed
+
+
+@benchmark
+async def json_serialize_states_stdlib(hass):
+    """Serialize million states with the stdlib JSONEncoder for comparison."""
+    states = [
+        core.State("light.kitchen", "on", {"friendly_name": "Kitchen Lights"})
+        for _ in range(10**6)
+    ]
+
+    start = timer()
+    json.dumps(states, cls=JSONEncoder, allow_nan=False)
     return timer() - start
 
 
+@benchmark
+async def recorder_insert_orm(hass):
+    """Insert 50k state changes into the recorder with ORM objects."""
+    return _recorder_insert(hass, bulk=False)
+
+
+@benchmark
+async def recorder_insert_bulk(hass):
+    """Insert 50k state changes into the recorder with bulk executemany."""
+    return _recorder_insert(hass, bulk=True)
+
+
+def _recorder_insert(hass, bulk):
+    """Insert state changed events into an in-memory database."""
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from homeassistant.components.recorder.bulk import BulkWriter
+    from homeassistant.components.recorder.models import (
+        Base,
+        Events,
+        EventTypes,
+        StateAttributes,
+        States,
+        StatesMeta,
+    )
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = Session(bind=engine)
+
+    events = []
+    old_states = {}
+    for idx in range(500):
+        for entity_idx in range(100):
+            entity_id = f"sensor.benchmark_{entity_idx}"
+            new_state = core.State(
+                entity_id,
+                str(idx),
+                {"unit_of_measurement": "W", "friendly_name": entity_id},
+            )
+            events.append(
+                core.Event(
+                    EVENT_STATE_CHANGED,
+                    {
+                        "entity_id": entity_id,
+                        "old_state": old_states.get(entity_id),
+                        "new_state": new_state,
+                    },
+                )
+            )
+            old_states[entity_id] = new_state
+
+    start = timer()
+    attributes_ids = {}
+    metadata_ids = {}
+    if bulk:
+        bulk_writer = BulkWriter()
+        event_type_id = bulk_writer.add_event_type(EVENT_STATE_CHANGED)
+        for event in events:
+            event_id = bulk_writer.add_event(event, event_type_id)
+            shared_attrs = StateAttributes.shared_attrs_from_event(event)
+            if not (attributes_id := attributes_ids.get(shared_attrs)):
+                attributes_id = attributes_ids[
+                    shared_attrs
+                ] = bulk_writer.add_state_attributes(
+                    shared_attrs, StateAttributes.hash_shared_attrs(shared_attrs)
+                )
+            entity_id = event.data["entity_id"]
+            if not (metadata_id := metadata_ids.get(entity_id)):
+                metadata_id = metadata_ids[entity_id] = bulk_writer.add_states_meta(
+                    entity_id
+                )
+            bulk_writer.add_state(event, event_id, attributes_id, metadata_id)
+        bulk_writer.write(session)
+    else:
+        last_states = {}
+        event_types = EventTypes(event_type=EVENT_STATE_CHANGED)
+        for event in events:
+            dbevent = Events.from_event(event, event_data="{}")
+            dbevent.created = event.time_fired
+            dbevent.event_types = event_types
+            session.add(dbevent)
+            dbstate = States.from_event(event)
+            shared_attrs = StateAttributes.shared_attrs_from_event(event)
+            if not (dbstate_attributes := attributes_ids.get(shared_attrs)):
+                dbstate_attributes = attributes_ids[shared_attrs] = StateAttributes(
+                    shared_attrs=shared_attrs,
+                    hash=StateAttributes.hash_shared_attrs(shared_attrs),
+                )
+            dbstate.state_attributes = dbstate_attributes
+            if not (states_meta := metadata_ids.get(dbstate.entity_id)):
+                states_meta = metadata_ids[dbstate.entity_id] = StatesMeta(
+                    entity_id=dbstate.entity_id
+                )
+            dbstate.states_meta = states_meta
+            dbstate.old_state = last_states.get(dbstate.entity_id)
+            dbstate.event = dbevent
+            dbstate.created = event.time_fired
+            session.add(dbstate)
+            last_states[dbstate.entity_id] = dbstate
+    session.commit()
+    runtime = timer() - start
+
+    print(f"Inserted {len(events) / runtime:.0f} state changes/sec")
+    session.close()
+    engine.dispose()
+    return runtime
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
@@ -413,6 +583,7 @@ def _create_state_changed_event_from_old_new(
             "entity_id"
             "domain"
             "attributes"
+            "shared_attrs"
             "state_id",
             "old_state_id",
         ],
@@ -420,7 +591,8 @@ def _create_state_changed_event_from_old_new(
 
     row.event_type = EVENT_STATE_CHANGED
     row.event_data = "{}"
-    row.attributes = attributes_json
+    row.attributes = None
+    row.shared_attrs = attributes_json
     row.time_fired = event_time_fired
     row.state = new_state and new_state.get("state")
     row.entity_id = entity_id
@@ -1,6 +1,7 @@
 """Executor util helpers."""
 from __future__ import annotations
 
+import asyncio
 from concurrent.futures import ThreadPoolExecutor
 import contextlib
 import logging
@@ -59,6 +60,15 @@ def join_or_interrupt_threads(
     return joined
 
 
+def default_executor_saturated(loop: asyncio.AbstractEventLoop) -> bool:
+    """Return if the default executor has as many queued jobs as workers."""
+    executor = getattr(loop, "_default_executor", None)
+    if not isinstance(executor, ThreadPoolExecutor):
+        return False
+    # pylint: disable-next=protected-access
+    return executor._work_queue.qsize() >= executor._max_workers
+
+
 class InterruptibleThreadPoolExecutor(ThreadPoolExecutor):
     """A ThreadPoolExecutor instance that will not deadlock on shutdown."""
 
@@ -5,15 +5,23 @@ from collections import deque
 from collections.abc import Callable
 import json
 import logging
-from typing import Any
+from typing import Any, Final
 
 from homeassistant.core import Event, State
 from homeassistant.exceptions import HomeAssistantError
 
 from .file import write_utf8_file, write_utf8_file_atomic
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
 _LOGGER = logging.getLogger(__name__)
 
+# The library used to serialize JSON, orjson when it is installed
+JSON_BACKEND: Final = "json" if orjson is None else "orjson"
+
 
 class SerializationError(HomeAssistantError):
     """Error serializing the data to JSON."""
@@ -43,6 +51,19 @@ def load_json(filename: str, default: list | dict | None = None) -> list | dict:
     return {} if default is None else default
 
 
+def json_bytes(data: Any, default: Callable[[Any], Any] | None = None) -> bytes:
+    """Serialize data to compact JSON bytes with the JSON backend.
+
+    orjson handles datetimes and subclasses of dict natively and writes
+    NaN as null. The stdlib fallback rejects NaN with a ValueError.
+    default is called for the other objects and raises TypeError for
+    the ones that can't be serialized.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=default, allow_nan=False).encode("UTF-8")
+
+
 def save_json(
     filename: str,
     data: list | dict,
@@ -56,7 +77,12 @@ def save_json(
     Returns True on success.
     """
     try:
-        json_data = json.dumps(data, indent=4, cls=encoder)
+        if encoder is None and orjson is not None:
+            json_data = orjson.dumps(
+                data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ).decode("UTF-8")
+        else:
+            json_data = json.dumps(data, indent=4, cls=encoder)
     except TypeError as error:
         msg = f"Failed to serialize to JSON: {filename}. Bad data at {format_unserializable_data(find_paths_unserializable_data(data))}"
         _LOGGER.error(msg)
@@ -385,6 +385,7 @@ def async_fire_time_changed(
     if datetime_ is None:
         datetime_ = date_util.utcnow()
 
+    hass.async_fire_tick(date_util.as_utc(datetime_))
     hass.bus.async_fire(EVENT_TIME_CHANGED, {"now": date_util.as_utc(datetime_)})
 
     for task in list(hass.loop._scheduled):
@@ -831,6 +831,66 @@ async def test_entity_ids_limit_via_api_with_skip_initial_state(hass, hass_clien
     assert response_json[1][0]["entity_id"] == "light.cow"
 
 
+async def test_fetch_period_api_stream(hass, hass_client):
+    """Test the streamed fetch period view matches the buffered one."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+    for idx in range(10):
+        hass.states.async_set("sensor.power", idx, {"unit_of_measurement": "W"})
+        hass.states.async_set("light.kitchen", "on" if idx % 2 else "off")
+    hass.states.async_set("light.cow", "on")
+
+    await hass.async_block_till_done()
+
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    for query in ("", "&minimal_response", "&filter_entity_id=sensor.power,light.cow"):
+        response = await client.get(f"/api/history/period/{start.isoformat()}?{query}")
+        assert response.status == HTTPStatus.OK
+        expected = sorted(
+            await response.json(), key=lambda states: states[0]["entity_id"]
+        )
+
+        with patch.object(history, "STREAM_CHUNK_SIZE", 1):
+            response = await client.get(
+                f"/api/history/period/{start.isoformat()}?stream{query}"
+            )
+        assert response.status == HTTPStatus.OK
+        assert response.headers["Transfer-Encoding"] == "chunked"
+        response_json = await response.json()
+        assert (
+            sorted(response_json, key=lambda states: states[0]["entity_id"]) == expected
+        )
+
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}?stream&filter_entity_id=sensor.power,light.cow"
+    )
+    response_json = await response.json()
+    assert [states[0]["entity_id"] for states in response_json] == [
+        "sensor.power",
+        "light.cow",
+    ]
+    assert len(response_json[0]) == 10
+
+
+async def test_fetch_period_api_stream_empty(hass, hass_client):
+    """Test the streamed fetch period view with no states."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    client = await hass_client()
+    response = await client.get(
+        f"/api/history/period/{dt_util.utcnow().isoformat()}?stream&filter_entity_id=light.none"
+    )
+    assert response.status == HTTPStatus.OK
+    assert await response.json() == []
+
+
 POWER_SENSOR_ATTRIBUTES = {
     "device_class": "power",
     "state_class": "measurement",
@@ -922,6 +982,176 @@ async def test_statistics_during_period(
     }
 
 
+async def _receive_history_backlog(client, msg_id):
+    """Collect the history stream messages up to the end of the backlog."""
+    states = {}
+    messages = 0
+    while True:
+        response = await client.receive_json()
+        assert response["id"] == msg_id
+        assert response["type"] == "event"
+        messages += 1
+        for entity_id, ent_states in response["event"]["states"].items():
+            states.setdefault(entity_id, []).extend(ent_states)
+        if response["event"].get("backlog_complete"):
+            return states, messages
+
+
+async def test_history_stream(hass, hass_ws_client):
+    """Test the history stream sends the backlog and then the live states."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+    for idx in range(5):
+        hass.states.async_set("sensor.power", idx)
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.cow", "on")
+
+    await hass.async_block_till_done()
+
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_ws_client()
+    with patch.object(history, "STREAM_MESSAGE_STATES", 2):
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "history/stream",
+                "start_time": start.isoformat(),
+                "entity_ids": ["sensor.power", "light.kitchen"],
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        states, messages = await _receive_history_backlog(client, 1)
+
+    assert messages == 4
+    assert list(states) == ["sensor.power", "light.kitchen"]
+    assert [state["state"] for state in states["sensor.power"]] == [
+        "0",
+        "1",
+        "2",
+        "3",
+        "4",
+    ]
+    assert [state["state"] for state in states["light.kitchen"]] == ["on"]
+
+    hass.states.async_set("light.cow", "off")
+    hass.states.async_set("sensor.power", 5, {"attr": 1})
+    hass.states.async_set("sensor.power", 5, {"attr": 2})
+    hass.states.async_set("light.kitchen", "off")
+    await hass.async_block_till_done()
+
+    response = await client.receive_json()
+    assert response["event"]["states"]["sensor.power"][0]["state"] == "5"
+    assert "backlog_complete" not in response["event"]
+    response = await client.receive_json()
+    assert response["event"]["states"]["light.kitchen"][0]["state"] == "off"
+
+    await client.send_json({"id": 2, "type": "unsubscribe_events", "subscription": 1})
+    response = await client.receive_json()
+    assert response["success"]
+
+
+async def test_history_stream_filters(hass, hass_ws_client):
+    """Test the history stream applies the configured filters to live states."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(
+        hass,
+        "history",
+        {
+            "history": {
+                "include": {"domains": ["light"]},
+                "exclude": {"entity_globs": ["light.k*"]},
+            }
+        },
+    )
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+    hass.states.async_set("light.cow", "on")
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("switch.match", "on")
+
+    await hass.async_block_till_done()
+
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {"id": 1, "type": "history/stream", "start_time": start.isoformat()}
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    states, _ = await _receive_history_backlog(client, 1)
+    assert list(states) == ["light.cow"]
+
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("switch.match", "off")
+    hass.states.async_set("light.cow", "off")
+    await hass.async_block_till_done()
+
+    response = await client.receive_json()
+    assert list(response["event"]["states"]) == ["light.cow"]
+
+
+async def test_history_stream_end_time_in_the_past(hass, hass_ws_client):
+    """Test the history stream only sends the backlog for a past period."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+    hass.states.async_set("light.kitchen", "on")
+
+    await hass.async_block_till_done()
+
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    end = dt_util.utcnow()
+    hass.states.async_set("light.kitchen", "off")
+    await hass.async_block_till_done()
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream",
+            "start_time": start.isoformat(),
+            "end_time": end.isoformat(),
+            "entity_ids": ["light.kitchen"],
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    states, messages = await _receive_history_backlog(client, 1)
+    assert messages == 2
+    assert [state["state"] for state in states["light.kitchen"]] == ["on"]
+
+    hass.states.async_set("light.kitchen", "on")
+    await hass.async_block_till_done()
+    await client.send_json({"id": 2, "type": "ping"})
+    response = await client.receive_json()
+    assert response["type"] == "pong"
+
+
+async def test_history_stream_bad_start_time(hass, hass_ws_client):
+    """Test the history stream with an invalid start time."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_ws_client()
+    await client.send_json({"id": 1, "type": "history/stream", "start_time": "cats"})
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_start_time"
+
+
 async def test_statistics_during_period_bad_start_time(hass, hass_ws_client):
     """Test statistics_during_period."""
     await hass.async_add_executor_job(init_recorder_component, hass)
@@ -1,5 +1,6 @@
 """Tests for Home Assistant View."""
 from http import HTTPStatus
+import json
 from unittest.mock import AsyncMock, Mock
 
 from aiohttp.web_exceptions import (
@@ -15,6 +16,7 @@ from homeassistant.components.http.view import (
     request_handler_factory,
 )
 from homeassistant.exceptions import ServiceNotFound, Unauthorized
+from homeassistant.util.json import JSON_BACKEND
 
 
 @pytest.fixture
@@ -34,9 +36,16 @@ async def test_invalid_json(caplog):
     view = HomeAssistantView()
 
     with pytest.raises(HTTPInternalServerError):
-        view.json(float("NaN"))
+        view.json(object())
 
-    assert str(float("NaN")) in caplog.text
+    assert "object" in caplog.text
+
+
+@pytest.mark.skipif(JSON_BACKEND != "orjson", reason="NaN is rejected by stdlib")
+async def test_nan_serialized_to_null():
+    """Test NaN is serialized to null by the orjson backend."""
+    response = HomeAssistantView.json(float("NaN"))
+    assert json.loads(response.body.decode("UTF-8")) is None
 
 
 async def test_handling_unauthorized(mock_request):
@@ -278,6 +278,7 @@ def create_state_changed_event_from_old_new(
             "entity_id"
             "domain"
             "attributes"
+            "shared_attrs"
             "state_id",
             "old_state_id",
         ],
@@ -285,7 +286,8 @@ def create_state_changed_event_from_old_new(
 
     row.event_type = EVENT_STATE_CHANGED
     row.event_data = "{}"
-    row.attributes = attributes_json
+    row.attributes = None
+    row.shared_attrs = attributes_json
     row.time_fired = event_time_fired
     row.state = new_state and new_state.get("state")
     row.entity_id = entity_id
@@ -1864,6 +1866,167 @@ async def test_context_filter(hass, hass_client):
     assert response.status == HTTPStatus.BAD_REQUEST
 
 
+async def test_event_stream(hass, hass_ws_client):
+    """Test the event stream sends the backlog and then the live entries."""
+    await async_init_recorder_component(hass)
+    await async_setup_component(hass, "logbook", {})
+    await async_setup_component(hass, "automation", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+
+    hass.states.async_set("light.kitchen", STATE_OFF)
+    hass.states.async_set("light.kitchen", STATE_ON)
+    await _async_commit_and_wait(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {"id": 1, "type": "logbook/event_stream", "start_time": start.isoformat()}
+    )
+    response = await client.receive_json()
+    assert response["success"]
+
+    response = await client.receive_json()
+    assert response["event"]["backlog_complete"]
+    entries = response["event"]["events"]
+    assert len(entries) == 1
+    _assert_entry(entries[0], entity_id="light.kitchen", state=STATE_ON)
+
+    context = ha.Context()
+    hass.bus.async_fire(
+        EVENT_AUTOMATION_TRIGGERED,
+        {ATTR_NAME: "Mock automation", ATTR_ENTITY_ID: "automation.alarm"},
+        context=context,
+    )
+    hass.states.async_set(
+        "sensor.power", "1", {"unit_of_measurement": "W"}, context=context
+    )
+    hass.states.async_set(
+        "sensor.power", "2", {"unit_of_measurement": "W"}, context=context
+    )
+    hass.states.async_set("light.kitchen", STATE_ON, {"brightness": 10})
+    hass.states.async_set("light.kitchen", STATE_OFF, context=context)
+    await hass.async_block_till_done()
+
+    response = await client.receive_json()
+    entries = response["event"]["events"]
+    assert len(entries) == 1
+    assert entries[0]["name"] == "Mock automation"
+    assert entries[0]["domain"] == "automation"
+
+    response = await client.receive_json()
+    entries = response["event"]["events"]
+    assert len(entries) == 1
+    _assert_entry(entries[0], entity_id="light.kitchen", state=STATE_OFF)
+    assert entries[0]["context_entity_id"] == "automation.alarm"
+    assert entries[0]["context_event_type"] == EVENT_AUTOMATION_TRIGGERED
+    assert entries[0]["context_name"] == "Mock automation"
+
+    await client.send_json({"id": 2, "type": "unsubscribe_events", "subscription": 1})
+    response = await client.receive_json()
+    assert response["success"]
+
+
+async def test_event_stream_entity_ids(hass, hass_ws_client):
+    """Test the event stream only sends the entries of the given entities."""
+    await async_init_recorder_component(hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+
+    for entity_id in ("light.kitchen", "light.cow"):
+        hass.states.async_set(entity_id, STATE_OFF)
+        hass.states.async_set(entity_id, STATE_ON)
+    await _async_commit_and_wait(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "logbook/event_stream",
+            "start_time": start.isoformat(),
+            "entity_ids": ["light.cow"],
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+
+    response = await client.receive_json()
+    entries = response["event"]["events"]
+    assert len(entries) == 1
+    _assert_entry(entries[0], entity_id="light.cow", state=STATE_ON)
+
+    hass.states.async_set("light.kitchen", STATE_OFF)
+    hass.states.async_set("light.cow", STATE_OFF)
+    await hass.async_block_till_done()
+
+    response = await client.receive_json()
+    entries = response["event"]["events"]
+    assert len(entries) == 1
+    _assert_entry(entries[0], entity_id="light.cow", state=STATE_OFF)
+
+
+async def test_event_stream_end_time_in_the_past(hass, hass_ws_client):
+    """Test the event stream only sends the backlog for a past period."""
+    await async_init_recorder_component(hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+
+    hass.states.async_set("light.kitchen", STATE_OFF)
+    hass.states.async_set("light.kitchen", STATE_ON)
+    await _async_commit_and_wait(hass)
+    end = dt_util.utcnow()
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "logbook/event_stream",
+            "start_time": start.isoformat(),
+            "end_time": end.isoformat(),
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    response = await client.receive_json()
+    assert response["event"]["backlog_complete"]
+    assert len(response["event"]["events"]) == 1
+
+    hass.states.async_set("light.kitchen", STATE_OFF)
+    await hass.async_block_till_done()
+    await client.send_json({"id": 2, "type": "ping"})
+    response = await client.receive_json()
+    assert response["type"] == "pong"
+
+
+async def test_event_stream_bad_start_time(hass, hass_ws_client):
+    """Test the event stream with an invalid start time."""
+    await async_init_recorder_component(hass)
+    await async_setup_component(hass, "logbook", {})
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {"id": 1, "type": "logbook/event_stream", "start_time": "cats"}
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_start_time"
+
+
+def test_context_lookup_evicts_oldest_contexts():
+    """Test the context lookup is bounded."""
+    context_lookup = logbook.ContextLookup(2)
+    assert context_lookup.setdefault(None, "event") is None
+    assert context_lookup.setdefault("a", "event_a") == "event_a"
+    assert context_lookup.setdefault("a", "event_a2") == "event_a"
+    context_lookup.setdefault("b", "event_b")
+    context_lookup.setdefault("c", "event_c")
+    assert context_lookup.get("a") is None
+    assert context_lookup.get("b") == "event_b"
+    assert context_lookup.get("c") == "event_c"
+    assert context_lookup.get(None) is None
+
+
 async def _async_fetch_logbook(client, params=None):
     if params is None:
         params = {}
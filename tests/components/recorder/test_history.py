@@ -7,6 +7,7 @@ from unittest.mock import patch, sentinel
 
 from homeassistant.components.recorder import history
 from homeassistant.components.recorder.models import process_timestamp
+from homeassistant.components.recorder.util import session_scope
 import homeassistant.core as ha
 from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
@@ -217,6 +218,23 @@ def test_get_significant_states_minimal_response(hass_recorder):
     assert states == hist
 
 
+def test_get_significant_states_minimal_response_epoch_timestamps(hass_recorder):
+    """Test minimal states can have their last_changed as an epoch timestamp."""
+    hass = hass_recorder()
+    zero, four, states = record_states(hass)
+    hist = history.get_significant_states(
+        hass, zero, four, minimal_response=True, epoch_timestamps=True
+    )
+
+    input_state = states["media_player.test"][1]
+    states["media_player.test"][1] = {
+        "last_changed": input_state.last_changed.timestamp(),
+        "state": input_state.state,
+    }
+
+    assert states == hist
+
+
 def test_get_significant_states_with_initial(hass_recorder):
     """Test that only significant states are returned.
 
@@ -318,6 +336,49 @@ def test_get_significant_states_are_ordered(hass_recorder):
     assert list(hist.keys()) == entity_ids
 
 
+def _iter_significant_states(hass, *args, **kwargs):
+    """Collect the streamed significant states into a dict."""
+    with session_scope(hass=hass) as session:
+        return {
+            entity_id: list(states)
+            for entity_id, states in history.iter_significant_states_with_session(
+                hass, session, *args, **kwargs
+            )
+        }
+
+
+def test_iter_significant_states(hass_recorder):
+    """Test the streamed significant states match the buffered ones."""
+    hass = hass_recorder()
+    zero, four, states = record_states(hass)
+
+    with patch.object(history, "STREAM_BATCH_SIZE", 1):
+        hist = _iter_significant_states(hass, zero, four)
+    assert states == hist
+
+    hist = _iter_significant_states(hass, zero, four, minimal_response=True)
+    assert hist == history.get_significant_states(
+        hass, zero, four, minimal_response=True
+    )
+
+
+def test_iter_significant_states_entity_ids(hass_recorder):
+    """Test the streamed significant states keep the order of the entity ids."""
+    hass = hass_recorder()
+    zero, four, states = record_states(hass)
+    entity_ids = ["thermostat.test", "media_player.test", "not.recorded"]
+
+    hist = _iter_significant_states(hass, zero, four, entity_ids)
+    assert list(hist) == entity_ids[:2]
+    assert hist == {entity_id: states[entity_id] for entity_id in entity_ids[:2]}
+
+    one = zero + timedelta(seconds=1)
+    hist = _iter_significant_states(hass, one, four, entity_ids, minimal_response=True)
+    assert hist == history.get_significant_states(
+        hass, one, four, entity_ids, minimal_response=True
+    )
+
+
 def test_get_significant_states_only(hass_recorder):
     """Test significant states when significant_states_only is set."""
     hass = hass_recorder()
@@ -12,6 +12,7 @@ from sqlalchemy.exc import DatabaseError, OperationalError, SQLAlchemyError
 from homeassistant.components import recorder
 from homeassistant.components.recorder import (
     CONF_AUTO_PURGE,
+    CONF_BULK_INSERT,
     CONF_DB_URL,
     CONFIG_SCHEMA,
     DOMAIN,
@@ -29,8 +30,11 @@ from homeassistant.components.recorder import (
 from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.models import (
     Events,
+    EventTypes,
     RecorderRuns,
+    StateAttributes,
     States,
+    StatesMeta,
     StatisticsRuns,
     process_timestamp,
 )
@@ -141,14 +145,167 @@ async def test_saving_state(
     await async_wait_recording_done(hass, instance)
 
     with session_scope(hass=hass) as session:
-        db_states = list(session.query(States))
+        db_states = []
+        for db_state, db_state_attributes in session.query(
+            States, StateAttributes
+        ).outerjoin(
+            StateAttributes, States.attributes_id == StateAttributes.attributes_id
+        ):
+            db_states.append(db_state)
+            state = db_state.to_native()
+            state.attributes = db_state_attributes.to_native()
         assert len(db_states) == 1
         assert db_states[0].event_id > 0
-        state = db_states[0].to_native()
 
     assert state == _state_empty_context(hass, entity_id)
 
 
+async def test_async_block_till_done_commits_pending_events(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test async_block_till_done commits the events of the commit interval."""
+    instance = await async_setup_recorder_instance(hass, {"commit_interval": 30})
+
+    hass.states.async_set("test.recorder", "on")
+    await hass.async_block_till_done()
+    await instance.async_block_till_done()
+
+    def _count_states():
+        with session_scope(hass=hass) as session:
+            return session.query(States).count()
+
+    assert await hass.async_add_executor_job(_count_states) == 1
+
+
+async def test_saving_states_shares_attributes(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test states with the same attributes share a state_attributes row."""
+    instance = await async_setup_recorder_instance(hass)
+    attributes = {"test_attr": 5, "test_attr_10": "nice"}
+
+    hass.states.async_set("test.one", "on", attributes)
+    hass.states.async_set("test.two", "on", attributes)
+    await async_wait_recording_done(hass, instance)
+
+    # Served from the attributes id cache after the commit
+    hass.states.async_set("test.one", "off", attributes)
+    hass.states.async_set("test.three", "on", {"test_attr": 6})
+    await async_wait_recording_done(hass, instance)
+
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States))
+        assert len(db_states) == 4
+        assert session.query(StateAttributes).count() == 2
+        assert len({db_state.attributes_id for db_state in db_states}) == 2
+        assert all(db_state.attributes is None for db_state in db_states)
+
+
+async def test_saving_states_and_events_link_dimension_tables(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test states and events are linked to the states_meta and event_types tables."""
+    instance = await async_setup_recorder_instance(hass)
+
+    hass.states.async_set("test.one", "on")
+    hass.states.async_set("test.two", "on")
+    hass.bus.async_fire("test_event")
+    await async_wait_recording_done(hass, instance)
+
+    # Served from the id maps after the commit
+    hass.states.async_set("test.one", "off")
+    hass.bus.async_fire("test_event")
+    await async_wait_recording_done(hass, instance)
+
+    with session_scope(hass=hass) as session:
+        metadata_ids = {
+            states_meta.entity_id: states_meta.metadata_id
+            for states_meta in session.query(StatesMeta)
+        }
+        assert set(metadata_ids) == {"test.one", "test.two"}
+        db_states = list(session.query(States))
+        assert len(db_states) == 3
+        for db_state in db_states:
+            assert db_state.metadata_id == metadata_ids[db_state.entity_id]
+
+        event_type_ids = {
+            event_types.event_type: event_types.event_type_id
+            for event_types in session.query(EventTypes)
+        }
+        assert session.query(Events).filter_by(event_type="test_event").count() == 2
+        for db_event in session.query(Events):
+            assert db_event.event_type_id == event_type_ids[db_event.event_type]
+
+        assert instance.states_meta_ids.get_many(
+            session, ["test.one", "test.missing"]
+        ) == {
+            "test.one": metadata_ids["test.one"],
+            "test.missing": None,
+        }
+
+
+async def test_saving_states_bulk_insert(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test saving states and events with bulk inserts."""
+    instance = await async_setup_recorder_instance(hass, {CONF_BULK_INSERT: True})
+    attributes = {"test_attr": 5, "test_attr_10": "nice"}
+
+    hass.states.async_set("test.one", "on", attributes)
+    hass.states.async_set("test.two", "on", attributes)
+    hass.bus.async_fire("test_event", {"some_data": 1})
+    await async_wait_recording_done(hass, instance)
+
+    hass.states.async_set("test.one", "off", attributes)
+    hass.states.async_remove("test.two")
+    await async_wait_recording_done(hass, instance)
+
+    with session_scope(hass=hass) as session:
+        db_states = {
+            (db_state.entity_id, db_state.state): db_state
+            for db_state in session.query(States)
+        }
+        assert len(db_states) == 4
+        assert session.query(StateAttributes).count() == 2
+        assert (
+            db_states[("test.one", "off")].old_state_id
+            == db_states[("test.one", "on")].state_id
+        )
+        assert (
+            db_states[("test.two", None)].old_state_id
+            == db_states[("test.two", "on")].state_id
+        )
+        assert db_states[("test.one", "on")].old_state_id is None
+        assert (
+            db_states[("test.one", "on")].attributes_id
+            == db_states[("test.two", "on")].attributes_id
+        )
+        assert (
+            db_states[("test.one", "on")].metadata_id
+            == db_states[("test.one", "off")].metadata_id
+            != db_states[("test.two", "on")].metadata_id
+        )
+        for db_state in db_states.values():
+            assert db_state.event_id is not None
+            assert db_state.attributes is None
+
+        db_event = session.query(Events).filter_by(event_type="test_event").one()
+        assert db_event.to_native().data == {"some_data": 1}
+        assert (
+            session.query(EventTypes.event_type)
+            .filter_by(event_type_id=db_event.event_type_id)
+            .scalar()
+            == "test_event"
+        )
+
+        db_attributes = (
+            session.query(StateAttributes)
+            .filter_by(attributes_id=db_states[("test.one", "off")].attributes_id)
+            .one()
+        )
+        assert db_attributes.to_native() == attributes
+
+
 async def test_saving_many_states(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
@@ -375,7 +532,14 @@ def _add_entities(hass, entity_ids):
     wait_recording_done(hass)
 
     with session_scope(hass=hass) as session:
-        return [st.to_native() for st in session.query(States)]
+        states = []
+        for state, state_attributes in session.query(States, StateAttributes).join(
+            StateAttributes, States.attributes_id == StateAttributes.attributes_id
+        ):
+            native_state = state.to_native()
+            native_state.attributes = state_attributes.to_native()
+            states.append(native_state)
+        return states
 
 
 def _add_events(hass, events):
@@ -358,6 +358,51 @@ def test_forgiving_add_index():
         migration._create_index(instance, "states", "ix_states_context_id")
 
 
+def test_migrate_timestamp_columns():
+    """Test the epoch timestamp columns are filled from the datetime columns."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    models.Base.metadata.create_all(engine)
+    last_changed = datetime.datetime(2022, 1, 1, 10, 0, 0, 123456)
+    last_updated = datetime.datetime(2022, 1, 1, 11, 0, 0)
+    with Session(engine) as session:
+        for _ in range(5):
+            session.add(
+                States(
+                    entity_id="sensor.test",
+                    state="on",
+                    last_changed=last_changed,
+                    last_updated=last_updated,
+                )
+            )
+        session.commit()
+
+    with Session(engine) as session, patch.object(
+        migration, "TIMESTAMP_MIGRATION_BATCH_SIZE", 2
+    ):
+        instance = Mock()
+        instance.get_session = Mock(return_value=session)
+        migration._migrate_timestamp_columns(
+            instance,
+            States.__table__,
+            States.state_id,
+            {
+                "last_changed_ts": States.last_changed,
+                "last_updated_ts": States.last_updated,
+            },
+        )
+
+    with Session(engine) as session:
+        timestamps = session.query(States.last_changed_ts, States.last_updated_ts).all()
+        assert len(timestamps) == 5
+        for last_changed_ts, last_updated_ts in timestamps:
+            assert dt_util.utc_from_timestamp(last_changed_ts) == last_changed.replace(
+                tzinfo=dt_util.UTC
+            )
+            assert dt_util.utc_from_timestamp(last_updated_ts) == last_updated.replace(
+                tzinfo=dt_util.UTC
+            )
+
+
 @pytest.mark.parametrize(
     "exception_type", [OperationalError, ProgrammingError, InternalError]
 )
@@ -6,14 +6,18 @@ from unittest.mock import MagicMock, patch
 
 from sqlalchemy.exc import DatabaseError, OperationalError
 from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.expression import distinct
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder import PurgeTask
-from homeassistant.components.recorder.const import MAX_ROWS_TO_PURGE
+from homeassistant.components.recorder.const import DATA_INSTANCE, MAX_ROWS_TO_PURGE
 from homeassistant.components.recorder.models import (
     Events,
+    EventTypes,
     RecorderRuns,
+    StateAttributes,
     States,
+    StatesMeta,
     StatisticsRuns,
     StatisticsShortTerm,
 )
@@ -52,6 +56,11 @@ async def test_purge_old_states(
         assert events.count() == 6
         assert "test.recorder2" in instance._old_states
 
+        # all states share the same attributes
+        state_attributes = session.query(StateAttributes)
+        assert state_attributes.count() == 1
+        assert states[0].attributes_id == states[-1].attributes_id
+
         purge_before = dt_util.utcnow() - timedelta(days=4)
 
         # run purge_old_data()
@@ -69,12 +78,17 @@ async def test_purge_old_states(
         assert states.count() == 2
         assert "test.recorder2" in instance._old_states
 
+        # the attributes are still used by the remaining states
+        assert state_attributes.count() == 1
+
         # run purge_old_data again
         purge_before = dt_util.utcnow()
         finished = purge_old_data(instance, purge_before, repack=False)
         assert not finished
         assert states.count() == 0
+        assert state_attributes.count() == 0
         assert "test.recorder2" not in instance._old_states
+        assert len(instance._state_attributes_ids) == 0
 
     # Add some more states
     await _add_test_states(hass, instance)
@@ -580,6 +594,7 @@ async def test_purge_filtered_states(
 
     service_data = {"keep_days": 10}
     _add_db_entries(hass)
+    _link_dimension_tables(hass)
 
     with session_scope(hass=hass) as session:
         states = session.query(States)
@@ -670,6 +685,7 @@ async def test_purge_filtered_events(
 
     service_data = {"keep_days": 10}
     _add_db_entries(hass)
+    _link_dimension_tables(hass)
 
     with session_scope(hass=hass) as session:
         events_purge = session.query(Events).filter(Events.event_type == "EVENT_PURGE")
@@ -786,6 +802,7 @@ async def test_purge_filtered_events_state_changed(
 
     service_data = {"keep_days": 10, "apply_filter": True}
     _add_db_entries(hass)
+    _link_dimension_tables(hass)
 
     with session_scope(hass=hass) as session:
         events_keep = session.query(Events).filter(Events.event_type == "EVENT_KEEP")
@@ -886,6 +903,7 @@ async def test_purge_entities(
 
     _add_purge_records(hass)
     _add_keep_records(hass)
+    _link_dimension_tables(hass)
 
     # Confirm standard service call
     with session_scope(hass=hass) as session:
@@ -903,6 +921,7 @@ async def test_purge_entities(
         assert states_sensor_kept.count() == 10
 
     _add_purge_records(hass)
+    _link_dimension_tables(hass)
 
     # Confirm each parameter purges only the associated records
     with session_scope(hass=hass) as session:
@@ -924,6 +943,7 @@ async def test_purge_entities(
         assert states_sensor_kept.count() == 10
 
     _add_purge_records(hass)
+    _link_dimension_tables(hass)
 
     # Confirm calling service without arguments matches all records (default filter behaviour)
     with session_scope(hass=hass) as session:
@@ -1108,3 +1128,37 @@ def _add_state_and_state_changed_event(
             time_fired=timestamp,
         )
     )
+
+
+def _link_dimension_tables(hass: HomeAssistant) -> None:
+    """Link states and events added directly to the db to the dimension tables."""
+    instance = hass.data[DATA_INSTANCE]
+    with recorder.session_scope(hass=hass) as session:
+        for (entity_id,) in (
+            session.query(distinct(States.entity_id))
+            .filter(States.metadata_id.is_(None))
+            .all()
+        ):
+            states_meta = session.query(StatesMeta).filter_by(
+                entity_id=entity_id
+            ).one_or_none() or StatesMeta(entity_id=entity_id)
+            session.add(states_meta)
+            session.flush()
+            session.query(States).filter_by(
+                entity_id=entity_id, metadata_id=None
+            ).update({"metadata_id": states_meta.metadata_id})
+            instance.states_meta_ids.update({entity_id: states_meta.metadata_id})
+        for (event_type,) in (
+            session.query(distinct(Events.event_type))
+            .filter(Events.event_type_id.is_(None))
+            .all()
+        ):
+            event_types = session.query(EventTypes).filter_by(
+                event_type=event_type
+            ).one_or_none() or EventTypes(event_type=event_type)
+            session.add(event_types)
+            session.flush()
+            session.query(Events).filter_by(
+                event_type=event_type, event_type_id=None
+            ).update({"event_type_id": event_types.event_type_id})
+            instance.event_type_ids.update({event_type: event_types.event_type_id})
@@ -20,6 +20,7 @@ from homeassistant.helpers import entity
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.loader import async_get_integration
 from homeassistant.setup import DATA_SETUP_TIME, async_setup_component
+from homeassistant.util.json import JSON_BACKEND
 
 from tests.common import MockEntity, MockEntityPlatform, async_mock_service
 
@@ -586,14 +587,148 @@ async def test_states_filters_visible(hass, hass_admin_user, websocket_client):
 
 
 async def test_get_states_not_allows_nan(hass, websocket_client):
-    """Test get_states command not allows NaN floats."""
+    """Test get_states command does not send NaN floats."""
     hass.states.async_set("greeting.hello", "world", {"hello": float("NaN")})
 
     await websocket_client.send_json({"id": 5, "type": "get_states"})
 
     msg = await websocket_client.receive_json()
-    assert not msg["success"]
-    assert msg["error"]["code"] == const.ERR_UNKNOWN_ERROR
+    if JSON_BACKEND == "orjson":
+        # orjson serializes NaN as null
+        assert msg["success"]
+        assert msg["result"][0]["attributes"] == {"hello": None}
+    else:
+        assert not msg["success"]
+        assert msg["error"]["code"] == const.ERR_UNKNOWN_ERROR
+
+
+async def test_subscribe_entities(hass, websocket_client, hass_admin_user):
+    """Test subscribe entities sends the states and then their diffs."""
+    hass_admin_user.mock_policy({"entities": {"entity_ids": {"light.permitted": True}}})
+    hass.states.async_set("light.permitted", "off", {"color": "red"})
+    hass.states.async_set("light.not_permitted", "off")
+    original_state = hass.states.get("light.permitted")
+
+    await websocket_client.send_json({"id": 7, "type": "subscribe_entities"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {
+        "a": {
+            "light.permitted": {
+                "a": {"color": "red"},
+                "c": original_state.context.id,
+                "lc": original_state.last_changed.timestamp(),
+                "s": "off",
+            }
+        }
+    }
+
+    hass.states.async_set("light.not_permitted", "on")
+    hass.states.async_set("light.permitted", "on", {"brightness": 10})
+    new_state = hass.states.get("light.permitted")
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {
+        "c": {
+            "light.permitted": {
+                "+": {
+                    "a": {"brightness": 10},
+                    "c": new_state.context.id,
+                    "lc": new_state.last_changed.timestamp(),
+                    "s": "on",
+                },
+                "-": {"a": ["color"]},
+            }
+        }
+    }
+
+    hass.states.async_set("light.permitted", "on", {"brightness": 11})
+    updated_state = hass.states.get("light.permitted")
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "c": {
+            "light.permitted": {
+                "+": {
+                    "a": {"brightness": 11},
+                    "c": updated_state.context.id,
+                    "lu": updated_state.last_updated.timestamp(),
+                }
+            }
+        }
+    }
+
+    hass.states.async_remove("light.permitted")
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {"r": ["light.permitted"]}
+
+    hass.states.async_set("light.permitted", "off", context=Context(user_id="abc"))
+    added_state = hass.states.get("light.permitted")
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "a": {
+            "light.permitted": {
+                "a": {},
+                "c": {
+                    "id": added_state.context.id,
+                    "parent_id": None,
+                    "user_id": "abc",
+                },
+                "lc": added_state.last_changed.timestamp(),
+                "s": "off",
+            }
+        }
+    }
+
+
+async def test_subscribe_entities_with_entity_ids(hass, websocket_client):
+    """Test subscribe entities only sends the requested entities."""
+    hass.states.async_set("light.permitted", "off")
+    hass.states.async_set("light.other", "off")
+
+    await websocket_client.send_json(
+        {"id": 7, "type": "subscribe_entities", "entity_ids": ["light.permitted"]}
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert list(msg["event"]["a"]) == ["light.permitted"]
+
+    hass.states.async_set("light.other", "on")
+    hass.states.async_set("light.permitted", "on")
+
+    msg = await websocket_client.receive_json()
+    assert list(msg["event"]["c"]) == ["light.permitted"]
+
+
+async def test_subscribe_entities_skips_unserializable_states(
+    hass, websocket_client, caplog
+):
+    """Test subscribe entities leaves out states that can't be serialized."""
+    hass.states.async_set("light.permitted", "off")
+    hass.states.async_set("light.bad", "off", {"bad": object()})
+
+    await websocket_client.send_json({"id": 7, "type": "subscribe_entities"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert list(msg["event"]["a"]) == ["light.permitted"]
+    assert "Unable to serialize to JSON" in caplog.text
 
 
 async def test_subscribe_unsubscribe_events_whitelist(
@@ -1,12 +1,16 @@
 """Test Websocket API messages module."""
+import json
 
 from homeassistant.components.websocket_api.messages import (
     _cached_event_message as lru_event_cache,
+    _state_diff,
     cached_event_message,
+    construct_result_message,
     message_to_json,
+    result_message,
 )
 from homeassistant.const import EVENT_STATE_CHANGED
-from homeassistant.core import callback
+from homeassistant.core import Context, State, callback
 
 
 async def test_cached_event_message(hass):
@@ -83,16 +87,49 @@ async def test_message_to_json(caplog):
 
     json_str = message_to_json({"id": 1, "message": "xyz"})
 
-    assert json_str == '{"id": 1, "message": "xyz"}'
+    assert json.loads(json_str) == {"id": 1, "message": "xyz"}
 
     json_str2 = message_to_json({"id": 1, "message": _Unserializeable()})
 
-    assert (
-        json_str2
-        == '{"id": 1, "type": "result", "success": false, "error": {"code": "unknown_error", "message": "Invalid JSON in response"}}'
-    )
+    assert json.loads(json_str2) == {
+        "id": 1,
+        "type": "result",
+        "success": False,
+        "error": {"code": "unknown_error", "message": "Invalid JSON in response"},
+    }
     assert "Unable to serialize to JSON" in caplog.text
 
 
+def test_construct_result_message():
+    """Test we can splice a serialized payload into a result message."""
+    assert json.loads(construct_result_message(5, '[{"a":1}]')) == result_message(
+        5, [{"a": 1}]
+    )
+
+
+def test_state_diff_context():
+    """Test the state diff sends the full context when its parent or user changes."""
+    old_state = State("light.kitchen", "on", context=Context(id="1"))
+    new_state = State(
+        "light.kitchen",
+        "on",
+        last_changed=old_state.last_changed,
+        last_updated=old_state.last_updated,
+        context=Context(id="2", user_id="abc"),
+    )
+    assert _state_diff(old_state, new_state) == {
+        "+": {"c": {"id": "2", "parent_id": None, "user_id": "abc"}}
+    }
+
+    newer_state = State(
+        "light.kitchen",
+        "on",
+        last_changed=old_state.last_changed,
+        last_updated=old_state.last_updated,
+        context=Context(id="3", user_id="abc"),
+    )
+    assert _state_diff(new_state, newer_state) == {"+": {"c": "3"}}
+
+
 class _Unserializeable:
     """A class that cannot be serialized."""
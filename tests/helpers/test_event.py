@@ -129,6 +129,116 @@ async def test_track_point_in_time_drift_rearm(hass):
     assert len(specific_runs) == 1
 
 
+def _timer_wheel_handles(hass):
+    """Return the loop timers armed by the timer wheel."""
+    return [
+        handle
+        for handle in hass.loop._scheduled
+        if not handle.cancelled()
+        and getattr(handle._callback, "__name__", None) == "_async_run_due"
+    ]
+
+
+async def test_track_point_in_time_shares_one_loop_timer(hass):
+    """Test timers due together run from a single loop timer."""
+    runs = []
+    now = dt_util.utcnow()
+    birthday_paulus = now + timedelta(hours=1)
+
+    for idx in range(3):
+        async_track_point_in_utc_time(
+            hass, callback(lambda x, idx=idx: runs.append(idx)), birthday_paulus
+        )
+    async_track_point_in_utc_time(
+        hass, callback(lambda x: runs.append("later")), now + timedelta(hours=2)
+    )
+    assert len(_timer_wheel_handles(hass)) == 1
+
+    async_fire_time_changed(hass, birthday_paulus + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert sorted(runs) == [0, 1, 2]
+    assert len(_timer_wheel_handles(hass)) == 1
+
+    async_fire_time_changed(hass, now + timedelta(hours=2, seconds=1))
+    await hass.async_block_till_done()
+    assert runs[-1] == "later"
+    assert len(_timer_wheel_handles(hass)) == 0
+
+
+async def test_track_point_in_time_cancelled_by_job_due_together(hass):
+    """Test a job can cancel another job that is due at the same time."""
+    runs = []
+    point_in_time = dt_util.utcnow() + timedelta(hours=1)
+    unsubs = []
+
+    @callback
+    def cancel_other(_):
+        runs.append("cancel")
+        for unsub in unsubs:
+            unsub()
+
+    async_track_point_in_utc_time(hass, cancel_other, point_in_time)
+    unsubs.append(
+        async_track_point_in_utc_time(
+            hass, callback(lambda x: runs.append("cancelled")), point_in_time
+        )
+    )
+
+    async_fire_time_changed(hass, point_in_time + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert runs == ["cancel"]
+
+
+async def test_track_point_in_time_job_error_does_not_stop_others(hass, caplog):
+    """Test a job that raises does not stop the jobs due with it."""
+    runs = []
+    point_in_time = dt_util.utcnow() + timedelta(hours=1)
+
+    @callback
+    def raise_error(_):
+        raise ValueError("boom")
+
+    async_track_point_in_utc_time(hass, raise_error, point_in_time)
+    async_track_point_in_utc_time(
+        hass, callback(lambda x: runs.append(x)), point_in_time + timedelta(seconds=1)
+    )
+
+    async_fire_time_changed(hass, point_in_time + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    assert len(runs) == 1
+    assert "Error running job" in caplog.text
+
+
+async def test_track_point_in_time_added_by_job_keeps_earlier_timers(hass):
+    """Test a timer added by a job does not delay the timers before it."""
+    runs = []
+    now = dt_util.utcnow()
+
+    @callback
+    def add_later(_):
+        runs.append("first")
+        async_track_point_in_utc_time(
+            hass, callback(lambda x: runs.append("third")), now + timedelta(hours=3)
+        )
+
+    async_track_point_in_utc_time(hass, add_later, now + timedelta(hours=1))
+    async_track_point_in_utc_time(
+        hass, callback(lambda x: runs.append("second")), now + timedelta(hours=2)
+    )
+
+    async_fire_time_changed(hass, now + timedelta(hours=1, seconds=1))
+    await hass.async_block_till_done()
+    assert runs == ["first"]
+
+    async_fire_time_changed(hass, now + timedelta(hours=2, seconds=1))
+    await hass.async_block_till_done()
+    assert runs == ["first", "second"]
+
+    async_fire_time_changed(hass, now + timedelta(hours=3, seconds=1))
+    await hass.async_block_till_done()
+    assert runs == ["first", "second", "third"]
+
+
 async def test_track_state_change_from_to_state_match(hass):
     """Test track_state_change with from and to state matchers."""
     from_and_to_state_runs = []
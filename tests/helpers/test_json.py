@@ -1,11 +1,18 @@
 """Test Home Assistant remote methods and classes."""
 import datetime
+import json
 
 import pytest
 
 from homeassistant import core
-from homeassistant.helpers.json import ExtendedJSONEncoder, JSONEncoder
+from homeassistant.helpers.json import (
+    ExtendedJSONEncoder,
+    JSONEncoder,
+    json_dumps,
+    json_encoder_default,
+)
 from homeassistant.util import dt as dt_util
+from homeassistant.util.read_only_dict import ReadOnlyDict
 
 
 @pytest.mark.parametrize("encoder", (JSONEncoder, ExtendedJSONEncoder))
@@ -35,6 +42,31 @@ def test_json_encoder_raises(hass):
         ha_json_enc.default(1)
 
 
+def test_json_dumps(hass):
+    """Test json_dumps matches the JSONEncoder output."""
+    now = dt_util.utcnow()
+    state = core.State("test.test", "hello", {"friendly_name": "Test"})
+    event = core.Event("test_event", {"time": now})
+    data = {
+        "state": state,
+        "event": event,
+        "now": now,
+        "set": {"milk"},
+        "read_only": ReadOnlyDict({"a": 1}),
+    }
+
+    assert json.loads(json_dumps(data)) == json.loads(json.dumps(data, cls=JSONEncoder))
+
+
+def test_json_encoder_default_raises(hass):
+    """Test the default conversion raises on unsupported types."""
+    with pytest.raises(TypeError):
+        json_encoder_default(object())
+
+    with pytest.raises(TypeError):
+        json_dumps({"bad": object()})
+
+
 def test_extended_json_encoder(hass):
     """Test the extended JSON encoder."""
     ha_json_enc = ExtendedJSONEncoder()
@@ -0,0 +1,130 @@
+"""Tests for the poll scheduler."""
+from datetime import timedelta
+from unittest.mock import patch
+
+from homeassistant.helpers import polling
+import homeassistant.util.dt as dt_util
+
+from tests.common import async_fire_time_changed
+
+
+async def test_next_poll_is_jittered(hass):
+    """Test polls are due on a jittered second that is never late."""
+    scheduler = polling.async_get_poll_scheduler(hass)
+    now = dt_util.utcnow()
+    interval = timedelta(seconds=30)
+
+    offsets = set()
+    for idx in range(20):
+        name = f"sensor.platform_{idx}"
+        point = scheduler.async_next_poll(name, interval, now)
+        assert now + interval - timedelta(seconds=1) < point <= now + interval
+        offset = round(point.timestamp() % 1, 3)
+        assert offset == scheduler.jitter(name)
+        offsets.add(offset)
+        # The offset is the same for every poll of a name
+        assert scheduler.async_next_poll(name, interval, point) == point + interval
+
+    assert len(offsets) > 1
+
+
+async def test_track_poll_interval(hass):
+    """Test polling at an interval records statistics."""
+    calls = []
+
+    async def action(now):
+        calls.append(now)
+
+    now = dt_util.utcnow()
+    remove = polling.async_track_poll_interval(
+        hass, action, timedelta(seconds=10), "light.test"
+    )
+
+    async_fire_time_changed(hass, now + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+
+    async_fire_time_changed(hass, now + timedelta(seconds=21))
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+
+    stats = polling.async_get_poll_stats(hass)["light.test"]
+    assert stats["polls"] == 2
+    assert stats["deferred"] == 0
+    assert stats["max_duration"] >= stats["last_duration"] >= 0
+
+    remove()
+    async_fire_time_changed(hass, now + timedelta(seconds=31))
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+
+
+async def test_polls_share_a_batch(hass):
+    """Test polls due at the same point are run with one timer."""
+    scheduler = polling.async_get_poll_scheduler(hass)
+    calls = []
+
+    async def action(now):
+        calls.append(now)
+
+    point = scheduler.async_next_poll("switch.test", timedelta(seconds=5))
+    scheduler.async_schedule("switch.test", point, action)
+    cancel = scheduler.async_schedule("switch.test", point, action)
+    scheduler.async_schedule("switch.test", point, action)
+    assert len(scheduler._batches) == 1
+    assert len(scheduler._unsub_batches) == 1
+
+    cancel()
+    async_fire_time_changed(hass, point + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+    assert not scheduler._batches
+    assert not scheduler._unsub_batches
+
+
+async def test_cancel_last_poll_of_batch(hass):
+    """Test cancelling every poll of a batch stops its timer."""
+    calls = []
+
+    async def action(now):
+        calls.append(now)
+
+    now = dt_util.utcnow()
+    cancel = polling.async_schedule_poll(
+        hass, action, timedelta(seconds=5), "switch.test"
+    )
+    cancel()
+    assert not polling.async_get_poll_scheduler(hass)._unsub_batches
+
+    async_fire_time_changed(hass, now + timedelta(seconds=6))
+    await hass.async_block_till_done()
+    assert not calls
+
+
+async def test_backpressure(hass):
+    """Test polls are held back while the executor is saturated."""
+    calls = []
+
+    async def action(now):
+        calls.append(now)
+
+    now = dt_util.utcnow()
+    polling.async_schedule_poll(hass, action, timedelta(seconds=5), "cover.test")
+
+    with patch(
+        "homeassistant.helpers.polling.default_executor_saturated", return_value=True
+    ):
+        for step in range(7):
+            async_fire_time_changed(hass, now + timedelta(seconds=6 + step / 2))
+            await hass.async_block_till_done()
+        assert not calls
+
+        # Polls are not held back for longer than the max delay
+        for step in range(7, 13):
+            async_fire_time_changed(hass, now + timedelta(seconds=6 + step / 2))
+            await hass.async_block_till_done()
+        assert len(calls) == 1
+
+    stats = polling.async_get_poll_stats(hass)["cover.test"]
+    assert stats["deferred"] == 10
+    assert stats["polls"] == 1
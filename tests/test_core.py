@@ -3,6 +3,7 @@
 import asyncio
 from datetime import datetime, timedelta
 import functools
+import json
 import logging
 import os
 from tempfile import TemporaryDirectory
@@ -388,6 +389,77 @@ def test_state_as_dict():
     assert state.as_dict() is as_dict_1
 
 
+def test_state_as_dict_json():
+    """Test a State as JSON."""
+    last_time = datetime(1984, 12, 8, 12, 0, 0, tzinfo=dt_util.UTC)
+    state = ha.State(
+        "happy.happy",
+        "on",
+        {"pig": "dog"},
+        last_updated=last_time,
+        last_changed=last_time,
+    )
+    as_dict_json_1 = state.as_dict_json()
+    assert json.loads(as_dict_json_1) == state.as_dict()
+    # 2nd time to verify cache
+    assert state.as_dict_json() is as_dict_json_1
+
+
+def test_state_as_dict_json_unserializable():
+    """Test a State with attributes that can't be serialized as JSON."""
+    state = ha.State("happy.happy", "on", {"pig": object()})
+    with pytest.raises(TypeError):
+        state.as_dict_json()
+
+
+def test_state_as_compressed_state():
+    """Test a State as a compressed dictionary."""
+    last_time = datetime(1984, 12, 8, 12, 0, 0, tzinfo=dt_util.UTC)
+    state = ha.State(
+        "happy.happy",
+        "on",
+        {"pig": "dog"},
+        last_updated=last_time,
+        last_changed=last_time,
+    )
+    expected = {
+        "a": {"pig": "dog"},
+        "c": state.context.id,
+        "lc": last_time.timestamp(),
+        "s": "on",
+    }
+    as_compressed_state_1 = state.as_compressed_state()
+    assert isinstance(as_compressed_state_1, ReadOnlyDict)
+    assert as_compressed_state_1 == expected
+    # 2nd time to verify cache
+    assert state.as_compressed_state() is as_compressed_state_1
+
+    as_compressed_state_json = state.as_compressed_state_json()
+    assert json.loads(f"{{{as_compressed_state_json}}}") == {"happy.happy": expected}
+    assert state.as_compressed_state_json() is as_compressed_state_json
+
+
+def test_state_as_compressed_state_last_updated_and_context():
+    """Test a compressed State keeps a separate last_updated and full context."""
+    last_changed = datetime(1984, 12, 8, 12, 0, 0, tzinfo=dt_util.UTC)
+    last_updated = datetime(1984, 12, 8, 13, 0, 0, tzinfo=dt_util.UTC)
+    context = ha.Context(user_id="abc", parent_id="def")
+    state = ha.State(
+        "happy.happy",
+        "on",
+        last_updated=last_updated,
+        last_changed=last_changed,
+        context=context,
+    )
+    assert state.as_compressed_state() == {
+        "a": {},
+        "c": {"id": context.id, "parent_id": "def", "user_id": "abc"},
+        "lc": last_changed.timestamp(),
+        "lu": last_updated.timestamp(),
+        "s": "on",
+    }
+
+
 async def test_eventbus_add_remove_listener(hass):
     """Test remove_listener method."""
     old_count = len(hass.bus.async_listeners())
@@ -436,6 +508,71 @@ async def test_eventbus_filtered_listener(hass):
     unsub()
 
 
+async def test_eventbus_run_immediately(hass, caplog):
+    """Test we can call listeners while the event is fired."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    @ha.callback
+    def listener_that_throws(event):
+        """Mock listener that raises."""
+        raise ValueError("boom")
+
+    hass.bus.async_listen("test", listener_that_throws, run_immediately=True)
+    unsub = hass.bus.async_listen("test", listener, run_immediately=True)
+
+    hass.bus.async_fire("test", {"event": True})
+    # No async_block_till_done here
+    assert len(calls) == 1
+    assert "Error running job" in caplog.text
+
+    unsub()
+
+    hass.bus.async_fire("test", {"event": True})
+    assert len(calls) == 1
+
+
+async def test_eventbus_run_immediately_requires_callback(hass):
+    """Test listeners that run immediately must be callbacks."""
+
+    def listener(event):
+        """Mock listener."""
+
+    with pytest.raises(ha.HomeAssistantError):
+        hass.bus.async_listen("test", listener, run_immediately=True)
+
+
+async def test_eventbus_run_immediately_listener_added_while_firing(hass):
+    """Test listeners added by a listener that runs immediately miss the event."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    @ha.callback
+    def listener_that_subscribes(event):
+        """Mock listener that adds another listener."""
+        hass.bus.async_listen("test", listener, run_immediately=True)
+
+    unsub = hass.bus.async_listen(
+        "test", listener_that_subscribes, run_immediately=True
+    )
+
+    hass.bus.async_fire("test")
+    assert len(calls) == 0
+
+    unsub()
+
+    hass.bus.async_fire("test")
+    assert len(calls) == 1
+
+
 async def test_eventbus_unsubscribe_listener(hass):
     """Test unsubscribe listener from returned function."""
     calls = []
@@ -1103,6 +1240,68 @@ def test_create_timer(mock_monotonic, loop):
     assert event_data[ATTR_NOW] == datetime(2018, 12, 31, 3, 4, 6, 100000)
 
 
+@patch("homeassistant.core.monotonic")
+def test_timer_skips_time_changed_without_listeners(mock_monotonic, loop):
+    """Test the timer only calls the tick listeners when nobody listens on the bus."""
+    hass = MagicMock()
+    hass.bus.async_has_listeners.return_value = False
+    mock_monotonic.side_effect = 10.2, 10.8, 11.3
+
+    with patch(
+        "homeassistant.core.dt_util.utcnow",
+        return_value=datetime(2018, 12, 31, 3, 4, 5, 333333),
+    ):
+        ha._async_create_timer(hass)
+
+    _, callback, target = hass.loop.call_later.mock_calls[0][1]
+
+    with patch(
+        "homeassistant.core.dt_util.utcnow",
+        return_value=datetime(2018, 12, 31, 3, 4, 6, 100000),
+    ):
+        callback(target)
+
+    assert hass.async_fire_tick.mock_calls[0][1] == (
+        datetime(2018, 12, 31, 3, 4, 6, 100000),
+    )
+    hass.bus.async_has_listeners.assert_called_once_with(EVENT_TIME_CHANGED)
+    assert len(hass.bus.async_fire.mock_calls) == 0
+
+
+async def test_tick_listener(hass, caplog):
+    """Test listening for the timer ticks."""
+    ticks = []
+    now = dt_util.utcnow()
+
+    @ha.callback
+    def listener(now):
+        """Mock tick listener."""
+        ticks.append(now)
+
+    @ha.callback
+    def listener_that_throws(now):
+        """Mock tick listener that raises."""
+        raise ValueError("boom")
+
+    hass.async_listen_tick(listener_that_throws)
+    unsub = hass.async_listen_tick(listener)
+    assert not hass.bus.async_has_listeners(EVENT_TIME_CHANGED)
+
+    hass.async_fire_tick(now)
+    assert ticks == [now]
+    assert "Error in tick listener" in caplog.text
+
+    unsub()
+    hass.async_fire_tick(now)
+    assert ticks == [now]
+
+    def not_a_callback(now):
+        """Mock tick listener that is not a callback."""
+
+    with pytest.raises(ha.HomeAssistantError):
+        hass.async_listen_tick(not_a_callback)
+
+
 @patch("homeassistant.core.monotonic")
 def test_timer_out_of_sync(mock_monotonic, loop):
     """Test create timer."""
@@ -1552,6 +1751,37 @@ async def test_async_entity_ids_count(hass):
     assert hass.states.async_entity_ids_count("light") == 3
 
 
+async def test_state_machine_domain_index(hass):
+    """Test domain queries stay in sync with the states."""
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("light.frog", "on")
+    hass.states.async_set("switch.link", "on")
+
+    assert hass.states.async_entity_ids("LIGHT") == ["light.bowl", "light.frog"]
+    assert hass.states.async_entity_ids(["switch", "light", "switch"]) == [
+        "switch.link",
+        "light.bowl",
+        "light.frog",
+    ]
+    assert hass.states.async_entity_ids_count(["light", "switch", "light"]) == 3
+    assert hass.states.async_entity_ids("vacuum") == []
+
+    hass.states.async_set("light.bowl", "off")
+    assert [state.state for state in hass.states.async_all("light")] == ["off", "on"]
+    assert hass.states.async_all("light")[0] is hass.states.get("light.bowl")
+
+    hass.states.async_remove("switch.link")
+    assert hass.states.async_all("switch") == []
+    assert hass.states.async_entity_ids_count("switch") == 0
+
+    hass.states.async_remove("light.bowl")
+    hass.states.async_set("light.bowl", "on")
+    assert hass.states.async_entity_ids("light") == ["light.frog", "light.bowl"]
+
+    hass.states.async_reserve("light.lamp")
+    assert hass.states.async_entity_ids_count("light") == 2
+
+
 async def test_hassjob_forbid_coroutine():
     """Test hassjob forbids coroutines."""
 
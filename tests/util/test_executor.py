@@ -1,8 +1,9 @@
 """Test Home Assistant executor util."""
 
 import concurrent.futures
+import threading
 import time
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import pytest
 
@@ -89,3 +90,21 @@ async def test_overall_timeout_reached(caplog):
     assert finish - start < 1
 
     iexecutor.shutdown()
+
+
+async def test_default_executor_saturated():
+    """Test detecting a backlog on the default executor of a loop."""
+    loop = Mock(_default_executor=None)
+    assert not executor.default_executor_saturated(loop)
+
+    iexecutor = InterruptibleThreadPoolExecutor(max_workers=1)
+    loop._default_executor = iexecutor
+    assert not executor.default_executor_saturated(loop)
+
+    release = threading.Event()
+    iexecutor.submit(release.wait)
+    iexecutor.submit(release.wait)
+    assert executor.default_executor_saturated(loop)
+
+    release.set()
+    iexecutor.shutdown()
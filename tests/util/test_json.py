@@ -1,19 +1,21 @@
 """Test Home Assistant json utility functions."""
 from datetime import datetime
 from functools import partial
-from json import JSONEncoder, dumps
+from json import JSONEncoder, dumps, loads
 import math
 import os
 from tempfile import mkdtemp
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 
 from homeassistant.core import Event, State
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import json as json_util
 from homeassistant.util.json import (
     SerializationError,
     find_paths_unserializable_data,
+    json_bytes,
     load_json,
     save_json,
 )
@@ -107,6 +109,40 @@ def test_custom_encoder():
     assert data == "9"
 
 
+def test_save_and_load_stdlib_fallback():
+    """Test saving and loading JSON without orjson."""
+    fname = _path_for("test7")
+    with patch.object(json_util, "orjson", None):
+        save_json(fname, TEST_JSON_A)
+    data = load_json(fname)
+    assert data == TEST_JSON_A
+
+
+@pytest.mark.parametrize("use_orjson", (True, False))
+def test_json_bytes(use_orjson):
+    """Test serializing to JSON bytes with and without orjson."""
+    if use_orjson and json_util.orjson is None:
+        pytest.skip("orjson is not installed")
+
+    def default(obj):
+        if isinstance(obj, set):
+            return sorted(obj)
+        raise TypeError
+
+    with patch.object(json_util, "orjson", json_util.orjson if use_orjson else None):
+        data = json_bytes({"a": {"c", "b"}, 1: [1.5, None]}, default)
+        assert loads(data) == {"a": ["b", "c"], "1": [1.5, None]}
+
+        with pytest.raises(TypeError):
+            json_bytes({"a": object()}, default)
+
+
+def test_json_bytes_stdlib_rejects_nan():
+    """Test the stdlib fallback does not write NaN."""
+    with patch.object(json_util, "orjson", None), pytest.raises(ValueError):
+        json_bytes(float("nan"))
+
+
 def test_find_unserializable_data():
     """Find unserializeable data."""
     assert find_paths_unserializable_data(1) == {}